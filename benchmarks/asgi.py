@@ -0,0 +1,54 @@
+"""
+Compare the throughput and latency of the app served by sync gunicorn workers
+over WSGI and by uvicorn workers over ASGI.
+
+Usage: python -m benchmarks.asgi --help
+"""
+
+import pathlib
+import tempfile
+
+import click
+
+from .common import gunicorn, hammer, info, report, setup_django
+
+MODES = ("sync", "uvicorn")
+
+
+def create_data(items):
+    """Create a user with a list of some items. Return the paths to request."""
+    from lists.models import Item, List
+    from users.models import User
+
+    user = User.objects.create(email="benchmark@example.com")
+    list_ = List.objects.create(owner=user)
+    Item.objects.bulk_create([Item(list=list_, text=f"item {i}") for i in range(items)])
+    return ["/", list_.get_absolute_url(), f"/lists/users/{user.email}/"]
+
+
+@click.command(context_settings={"max_content_width": 100})
+@click.option("--workers", "-w", type=int, default=2, show_default=True, help="Number of gunicorn workers.")
+@click.option("--concurrency", "-c", type=int, default=32, show_default=True, help="Number of concurrent clients.")
+@click.option("--requests", "-n", type=int, default=2000, show_default=True, help="Number of requests per mode.")
+@click.option("--items", type=int, default=50, show_default=True, help="Number of items in the requested list.")
+@click.option("--port", type=int, default=8100, show_default=True, help="Port to serve the app on.")
+def benchmark(workers, concurrency, requests, items, port):
+    """Benchmark the app served over WSGI and ASGI."""
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = pathlib.Path(directory) / "db.sqlite3"
+        info(f"Creating a database at {database_path}")
+        setup_django(database_path)
+        paths = create_data(items)
+
+        for mode in MODES:
+            info(f"Benchmarking {mode} workers")
+            env = {"GUNICORN_WORKER_CLASS": mode}
+            with gunicorn(env, port=port, args=["--workers", str(workers)]):
+                # Warm up the workers before timing them.
+                hammer(port, paths, concurrency, concurrency * len(paths))
+                timings, elapsed = hammer(port, paths, concurrency, requests)
+            report(f"{mode}: {workers} workers, {concurrency} concurrent clients", timings, elapsed)
+
+
+if __name__ == "__main__":
+    benchmark()
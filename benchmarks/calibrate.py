@@ -0,0 +1,136 @@
+"""
+Recommend the gunicorn worker class, number of workers and number of threads
+per worker which give the most throughput for the app's user journeys within a
+memory budget. Linux only, as it reads the memory usage of the workers from
+/proc.
+
+Each worker class and thread count is first run with a couple of workers to
+measure how much memory each worker uses, which gives the number of workers
+that fit in the budget. The load test is then run with that many workers to
+measure their throughput.
+
+Usage: python -m benchmarks.calibrate --help
+"""
+
+import math
+import multiprocessing
+import pathlib
+import statistics
+import tempfile
+
+import click
+
+from . import loadtest, memory
+from .common import app_env, gunicorn, info, setup_django, sub_info
+
+PROBE_WORKERS = 2
+
+
+def configurations(worker_classes, thread_counts):
+    """Return the (worker class, threads) pairs to try."""
+    pairs = []
+    for worker_class in worker_classes:
+        if worker_class == "gthread":
+            pairs.extend((worker_class, threads) for threads in thread_counts)
+        else:
+            pairs.append((worker_class, 1))
+    return pairs
+
+
+def measure_memory(master_pid):
+    """
+    Return the mean unique set size of a gunicorn master's workers and the
+    memory used by everything else: the master and the memory shared by the
+    workers, in MiB.
+    """
+    pids = memory.worker_pids(master_pid)
+    worker_uss = statistics.mean(memory.memory(pid)[0] for pid in pids)
+    total_pss = sum(memory.memory(pid)[1] for pid in [master_pid, *pids])
+    return worker_uss, total_pss - len(pids) * worker_uss
+
+
+def workers_within_budget(budget, worker_uss, fixed, max_workers):
+    """Return the number of workers which fit in a memory budget, in MiB."""
+    return min(max_workers, math.floor((budget - fixed) / worker_uss))
+
+
+@click.command(context_settings={"max_content_width": 100})
+@click.option("--memory-budget", "-m", type=float, required=True, help="MiB of memory that gunicorn can use.")
+@click.option(
+    "--worker-classes",
+    default="sync,gthread,uvicorn",
+    show_default=True,
+    help="Comma separated values of GUNICORN_WORKER_CLASS to try.",
+)
+@click.option(
+    "--threads",
+    "thread_counts",
+    default="2,4,8",
+    show_default=True,
+    help="Comma separated numbers of threads per gthread worker to try.",
+)
+@click.option(
+    "--max-workers",
+    type=int,
+    default=2 * multiprocessing.cpu_count() + 1,
+    show_default=True,
+    help="Most workers to recommend.",
+)
+@click.option("--concurrency", "-c", type=int, default=16, show_default=True, help="Number of simulated users.")
+@click.option("--duration", "-d", type=float, default=15, show_default=True, help="Seconds to run each load test for.")
+@click.option("--port", type=int, default=8100, show_default=True, help="Port to serve the app on.")
+def calibrate(memory_budget, worker_classes, thread_counts, max_workers, concurrency, duration, port):
+    """Recommend gunicorn settings which fit in a memory budget."""
+    pairs = configurations(worker_classes.split(","), [int(threads) for threads in thread_counts.split(",")])
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = pathlib.Path(directory) / "db.sqlite3"
+        info(f"Creating a database at {database_path}")
+        setup_django(database_path)
+        accounts, list_urls = loadtest.create_data(users=10, lists_per_user=5, items_per_list=100)
+
+        results = []
+        for worker_class, threads in pairs:
+            name = f"{worker_class} with {threads} threads" if worker_class == "gthread" else worker_class
+            env = app_env(database_path, GUNICORN_WORKER_CLASS=worker_class, GUNICORN_THREADS=str(threads))
+
+            info(f"Measuring the memory used by {name} workers")
+            with gunicorn(env, port=port, args=["--workers", str(PROBE_WORKERS)]) as process:
+                loadtest.run(port, concurrency, min(duration, 5), accounts, list_urls, items=3)
+                worker_uss, fixed = measure_memory(process.pid)
+
+            workers = workers_within_budget(memory_budget, worker_uss, fixed, max_workers)
+            if workers < 1:
+                sub_info(f"No {name} workers fit in {memory_budget:g} MiB")
+                continue
+
+            info(f"Running journeys for {duration:g}s with {workers} {name} workers")
+            with gunicorn(env, port=port, args=["--workers", str(workers)]):
+                timings, completed, elapsed = loadtest.run(port, concurrency, duration, accounts, list_urls, items=3)
+            errors = sum(timings.errors.values())
+            results.append((completed / elapsed, errors, worker_class, workers, threads, worker_uss, fixed))
+
+    if not results:
+        raise click.ClickException(f"No configuration fits in {memory_budget:g} MiB")
+
+    sub_info(f"Configurations which fit in {memory_budget:g} MiB")
+    click.echo(
+        f"{'worker class':<14} {'workers':>7} {'threads':>7} {'worker MiB':>10} {'fixed MiB':>9} "
+        f"{'journeys/s':>10} {'errors':>6}"
+    )
+    for throughput, errors, worker_class, workers, threads, worker_uss, fixed in sorted(results, reverse=True):
+        click.echo(
+            f"{worker_class:<14} {workers:>7} {threads:>7} {worker_uss:>10.1f} {fixed:>9.1f} "
+            f"{throughput:>10.1f} {errors:>6}"
+        )
+
+    # Prefer the configurations which didn't have any errors.
+    _, _, worker_class, workers, threads, *_ = max(results, key=lambda result: (result[1] == 0, result[0]))
+    info("Recommended settings")
+    click.echo(f"GUNICORN_WORKER_CLASS={worker_class}")
+    click.echo(f"GUNICORN_WORKERS={workers}")
+    click.echo(f"GUNICORN_THREADS={threads}")
+
+
+if __name__ == "__main__":
+    calibrate()
@@ -0,0 +1,239 @@
+"""
+Helpers for benchmarking the app against a real gunicorn server and a
+throwaway SQLite database.
+"""
+
+import contextlib
+import http.client
+import http.cookies
+import os
+import pathlib
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent import futures
+
+import click
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def info(info):
+    """Display some information."""
+    click.secho(info, fg="green", bold=True)
+
+
+def sub_info(info):
+    """Display some sub-information."""
+    click.secho(info, fg="red", bold=True)
+
+
+def app_env(database_path, **extra):
+    """
+    Return the environment variables which configure the app to use a database
+    and be served from localhost over HTTP.
+    """
+    return {
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark"),
+        "DATABASE_URL": f"sqlite:///{database_path}",
+        "DOMAIN": "127.0.0.1,localhost",
+        "CSRF_COOKIE_SECURE": "false",
+        "SESSION_COOKIE_SECURE": "false",
+        # The static files aren't collected, so there's no manifest of their
+        # hashed names.
+        "STATICFILES_STORAGE": "django.contrib.staticfiles.storage.StaticFilesStorage",
+        **extra,
+    }
+
+
+def setup_django(database_path):
+    """Configure Django in this process to use a database and migrate it."""
+    import django
+    from django.core.management import call_command
+
+    sys.path.insert(0, str(ROOT))
+    os.environ.update(app_env(database_path))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "superlists.settings")
+    django.setup()
+    call_command("migrate", verbosity=0)
+
+
+def _wait_for_port(port, timeout=30):
+    start = time.monotonic()
+    while True:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            if time.monotonic() - start > timeout:
+                raise
+            time.sleep(0.1)
+
+
+@contextlib.contextmanager
+def gunicorn(env, port=8100, args=()):
+    """
+    Run gunicorn with the app's config and some extra command line arguments
+    and environment variables until the context exits.
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--config",
+        "gunicorn.conf.py",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--access-logfile",
+        os.devnull,
+        *args,
+    ]
+    process = subprocess.Popen(command, cwd=ROOT, env={**os.environ, **env})
+    try:
+        _wait_for_port(port)
+        yield process
+    finally:
+        process.terminate()
+        process.wait()
+
+
+class Timings:
+    """Thread safe collection of request latencies, grouped by name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, name, latency, ok=True):
+        with self._lock:
+            self.latencies.setdefault(name, []).append(latency)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+
+class RequestFailed(Exception):
+    """A request couldn't be made or returned an error status."""
+
+
+class Client:
+    """
+    HTTP client for one simulated user. It keeps the cookies that the app sets,
+    sends the CSRF token with POST requests and records the latency of each
+    request against a name.
+    """
+
+    def __init__(self, port, timings):
+        self._connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        self._timings = timings
+        self.cookies = {}
+
+    def close(self):
+        self._connection.close()
+
+    def get(self, name, path):
+        return self.request(name, "GET", path)
+
+    def post(self, name, path, data):
+        data = {**data, "csrfmiddlewaretoken": self.cookies.get("csrftoken", "")}
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        return self.request(name, "POST", path, body=urllib.parse.urlencode(data), headers=headers)
+
+    def request(self, name, method, path, body=None, headers=None):
+        """
+        Make a request and return the response with its body read. Raise
+        RequestFailed if it fails.
+        """
+        headers = dict(headers or {})
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{key}={value}" for key, value in self.cookies.items())
+
+        start = time.perf_counter()
+        try:
+            self._connection.request(method, path, body=body, headers=headers)
+            response = self._connection.getresponse()
+            response.body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self._connection.close()
+            self._timings.record(name, time.perf_counter() - start, ok=False)
+            raise RequestFailed(f"{method} {path} failed: {e}")
+
+        ok = response.status < 400
+        self._timings.record(name, time.perf_counter() - start, ok=ok)
+        if not ok:
+            raise RequestFailed(f"{method} {path} returned {response.status}")
+
+        for header in response.headers.get_all("Set-Cookie") or []:
+            for key, morsel in http.cookies.SimpleCookie(header).items():
+                if morsel["max-age"] == "0":
+                    self.cookies.pop(key, None)
+                else:
+                    self.cookies[key] = morsel.value
+        return response
+
+
+def get(connection, path, headers=None):
+    """Make a GET request and return the response with its body read."""
+    connection.request("GET", path, headers=headers or {})
+    response = connection.getresponse()
+    response.read()
+    return response
+
+
+def hammer(port, paths, concurrency, requests):
+    """
+    GET some paths in turn from concurrent threads, with a connection per
+    thread, until the given number of requests have been made. Return the
+    timings and the elapsed time.
+    """
+    timings = Timings()
+    counter = iter(range(requests))
+    counter_lock = threading.Lock()
+
+    def worker():
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        while True:
+            with counter_lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            path = paths[i % len(paths)]
+            start = time.perf_counter()
+            try:
+                ok = get(connection, path).status < 400
+            except (OSError, http.client.HTTPException):
+                ok = False
+                connection.close()
+            timings.record(path, time.perf_counter() - start, ok=ok)
+        connection.close()
+
+    start = time.perf_counter()
+    with futures.ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return timings, time.perf_counter() - start
+
+
+def percentiles(latencies):
+    """Return the p50, p95 and p99 of some latencies, in milliseconds."""
+    if len(latencies) < 2:
+        return [latency * 1000 for latency in latencies * 3]
+    cut_points = statistics.quantiles(latencies, n=100)
+    return [cut_points[i] * 1000 for i in (49, 94, 98)]
+
+
+def report(title, timings, elapsed):
+    """Display the throughput and latency percentiles of some timings."""
+    sub_info(title)
+    click.echo(f"{'endpoint':<40} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, latencies in sorted(timings.latencies.items()):
+        p50, p95, p99 = percentiles(latencies)
+        errors = timings.errors.get(name, 0)
+        throughput = len(latencies) / elapsed
+        click.echo(f"{name:<40} {len(latencies):>8} {errors:>6} {throughput:>8.1f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}")
+    total = sum(len(latencies) for latencies in timings.latencies.values())
+    click.echo(f"{'total':<40} {total:>8} {sum(timings.errors.values()):>6} {total / elapsed:>8.1f}")
@@ -0,0 +1,99 @@
+"""
+Measure the throughput and latency of adding items to lists through the view
+list page, with some proportion of the items being duplicates.
+
+To compare two revisions of the app, run this against a checkout of each.
+
+Usage: python -m benchmarks.item_add --help
+"""
+
+import itertools
+import pathlib
+import random
+import tempfile
+import threading
+import time
+from concurrent import futures
+
+import click
+
+from .common import (
+    Client,
+    RequestFailed,
+    Timings,
+    gunicorn,
+    info,
+    report,
+    setup_django,
+)
+
+
+def create_lists(count):
+    """Create some empty lists. Return their URLs."""
+    from lists.models import List
+
+    return [List.objects.create().get_absolute_url() for _ in range(count)]
+
+
+def run(port, list_urls, requests, duplicates):
+    """
+    Add items to the lists from a thread per list until the given number of
+    requests have been made. Return the timings and the elapsed time.
+    """
+    timings = Timings()
+    counter = itertools.count()
+    counter_lock = threading.Lock()
+
+    def add_items(list_url):
+        client = Client(port, timings)
+        client.get("GET /lists/<pk>/", list_url)
+        texts = []
+        while True:
+            with counter_lock:
+                i = next(counter)
+            if i >= requests:
+                break
+            if texts and random.random() < duplicates:
+                name, text = "POST duplicate item", random.choice(texts)
+            else:
+                name, text = "POST new item", f"item {i}"
+                texts.append(text)
+            try:
+                client.post(name, list_url, {"text": text})
+            except RequestFailed:
+                # Failures are recorded in the timings.
+                pass
+        client.close()
+
+    start = time.perf_counter()
+    with futures.ThreadPoolExecutor(len(list_urls)) as executor:
+        for future in [executor.submit(add_items, list_url) for list_url in list_urls]:
+            future.result()
+    return timings, time.perf_counter() - start
+
+
+@click.command(context_settings={"max_content_width": 100})
+@click.option("--workers", "-w", type=int, default=2, show_default=True, help="Number of gunicorn workers.")
+@click.option("--concurrency", "-c", type=int, default=4, show_default=True, help="Number of lists added to at once.")
+@click.option("--requests", "-n", type=int, default=2000, show_default=True, help="Number of items to add.")
+@click.option(
+    "--duplicates", type=float, default=0.1, show_default=True, help="Proportion of items which are duplicates."
+)
+@click.option("--port", type=int, default=8100, show_default=True, help="Port to serve the app on.")
+def benchmark(workers, concurrency, requests, duplicates, port):
+    """Benchmark adding items to lists."""
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = pathlib.Path(directory) / "db.sqlite3"
+        info(f"Creating a database at {database_path}")
+        setup_django(database_path)
+        list_urls = create_lists(concurrency)
+
+        info(f"Adding {requests} items to {concurrency} lists")
+        with gunicorn({}, port=port, args=["--workers", str(workers)]):
+            timings, elapsed = run(port, list_urls, requests, duplicates)
+
+    report(f"{workers} workers, {concurrency} concurrent clients, {duplicates:.0%} duplicates", timings, elapsed)
+
+
+if __name__ == "__main__":
+    benchmark()
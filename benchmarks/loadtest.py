@@ -0,0 +1,151 @@
+"""
+Load test the app's user journeys against a real gunicorn server.
+
+Each simulated user repeatedly logs in, visits the home page, creates a list,
+adds items to it, shares it, views their lists and an existing large list, and
+logs out. The throughput and latency of each endpoint are reported at the end.
+
+Usage: python -m benchmarks.loadtest --help
+"""
+
+import pathlib
+import random
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent import futures
+
+import click
+
+from .common import (
+    Client,
+    RequestFailed,
+    Timings,
+    gunicorn,
+    info,
+    report,
+    setup_django,
+    sub_info,
+)
+
+
+def create_data(users, lists_per_user, items_per_list):
+    """
+    Create some users with lists of items using the test factories. Return the
+    users' emails and passwords and the URLs of their lists.
+    """
+    from lists.models import Item
+    from tests.fixtures.factories import ItemFactory, ListFactory, UserFactory
+
+    accounts = []
+    list_urls = []
+    for user in UserFactory.create_batch(users):
+        accounts.append((user.email, user.raw_password))
+        for list_ in ListFactory.create_batch(lists_per_user, owner=user):
+            Item.objects.bulk_create(ItemFactory.build_batch(items_per_list, list=list_))
+            list_urls.append(list_.get_absolute_url())
+    return accounts, list_urls
+
+
+def journey(client, account, accounts, list_urls, items):
+    """Run through the journeys that the functional tests cover, once."""
+    email, password = account
+
+    client.get("GET /login/", "/login/")
+    client.post("POST /login/", "/login/", {"username": email, "password": password})
+
+    client.get("GET /", "/")
+
+    response = client.post("POST /lists/new/", "/lists/new/", {"text": f"list by {email} at {time.time()}"})
+    list_url = urllib.parse.urlsplit(response.headers["Location"]).path
+    client.get("GET /lists/<pk>/", list_url)
+
+    for i in range(items):
+        client.post("POST /lists/<pk>/", list_url, {"text": f"item {i}"})
+    client.get("GET /lists/<pk>/", list_url)
+
+    sharee_email, _ = random.choice([other for other in accounts if other != account])
+    client.post("POST /lists/<pk>/share/", f"{list_url}share/", {"sharee": sharee_email})
+
+    client.get("GET /lists/users/<email>/", f"/lists/users/{email}/")
+    client.get("GET /lists/<pk>/ (existing)", random.choice(list_urls))
+
+    client.get("GET /logout/", "/logout/")
+
+
+def run(port, concurrency, duration, accounts, list_urls, items):
+    """
+    Run journeys from concurrent simulated users until the duration has passed.
+    Return the timings, the number of journeys completed and the elapsed time.
+    """
+    timings = Timings()
+    completed = 0
+    failures = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def simulated_user(i):
+        nonlocal completed, failures
+        account = accounts[i % len(accounts)]
+        while time.monotonic() < deadline:
+            client = Client(port, timings)
+            try:
+                journey(client, account, accounts, list_urls, items)
+            except RequestFailed as e:
+                with lock:
+                    failures += 1
+                    if failures <= 5:
+                        sub_info(str(e))
+            else:
+                with lock:
+                    completed += 1
+            finally:
+                client.close()
+
+    start = time.perf_counter()
+    with futures.ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(simulated_user, i) for i in range(concurrency)]:
+            future.result()
+    return timings, completed, time.perf_counter() - start
+
+
+@click.command(context_settings={"max_content_width": 100})
+@click.option("--concurrency", "-c", type=int, default=8, show_default=True, help="Number of simulated users.")
+@click.option("--duration", "-d", type=float, default=30, show_default=True, help="Seconds to run for.")
+@click.option("--workers", "-w", type=int, help="Number of gunicorn workers. Defaults to gunicorn.conf.py's.")
+@click.option(
+    "--worker-class",
+    type=click.Choice(["sync", "gthread", "uvicorn"]),
+    default="sync",
+    show_default=True,
+    help="Value of GUNICORN_WORKER_CLASS.",
+)
+@click.option("--threads", type=int, default=1, show_default=True, help="Number of threads per gthread worker.")
+@click.option("--users", type=int, default=10, show_default=True, help="Number of users to create.")
+@click.option("--lists-per-user", type=int, default=5, show_default=True, help="Number of lists to create per user.")
+@click.option("--items-per-list", type=int, default=100, show_default=True, help="Number of items per created list.")
+@click.option("--items", type=int, default=3, show_default=True, help="Number of items to add in each journey.")
+@click.option("--port", type=int, default=8100, show_default=True, help="Port to serve the app on.")
+def loadtest(concurrency, duration, workers, worker_class, threads, users, lists_per_user, items_per_list, items, port):
+    """Load test the app's user journeys."""
+    if users < 2:
+        raise click.BadParameter("at least 2 users are needed for sharing", param_hint="--users")
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = pathlib.Path(directory) / "db.sqlite3"
+        info(f"Creating a database at {database_path}")
+        setup_django(database_path)
+        accounts, list_urls = create_data(users, lists_per_user, items_per_list)
+
+        args = ["--workers", str(workers)] if workers else []
+        env = {"GUNICORN_WORKER_CLASS": worker_class, "GUNICORN_THREADS": str(threads)}
+        info(f"Running journeys for {duration:g}s with {worker_class} workers")
+        with gunicorn(env, port=port, args=args):
+            timings, completed, elapsed = run(port, concurrency, duration, accounts, list_urls, items)
+
+    report(f"{completed} journeys ({completed / elapsed:.1f}/s), {concurrency} simulated users", timings, elapsed)
+
+
+if __name__ == "__main__":
+    loadtest()
@@ -0,0 +1,85 @@
+"""
+Compare the memory used by each gunicorn worker with the app preloaded in the
+master and without. Linux only, as it reads the memory usage of the workers
+from /proc.
+
+Usage: python -m benchmarks.memory --help
+"""
+
+import pathlib
+import statistics
+import tempfile
+
+import click
+
+from . import asgi
+from .common import app_env, gunicorn, hammer, info, setup_django, sub_info
+
+MODES = {"not preloaded": "false", "preloaded": "true"}
+
+
+def worker_pids(pid):
+    """Return the process IDs of a gunicorn master's workers."""
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def memory(pid):
+    """
+    Return the unique set size of a process, which is the memory that would be
+    freed if it exited, and its proportional set size, which also includes its
+    share of the memory that it shares with other processes, in MiB.
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, value, *_ = line.split()
+            if value.isdigit():
+                fields[name.rstrip(":")] = int(value)
+    uss = fields["Private_Clean"] + fields["Private_Dirty"]
+    return uss / 1024, fields["Pss"] / 1024
+
+
+def report_memory(title, master_pid):
+    """Display the memory used by a gunicorn master and its workers."""
+    sub_info(title)
+    click.echo(f"{'process':<10} {'USS MiB':>8} {'PSS MiB':>8}")
+    pids = [master_pid, *worker_pids(master_pid)]
+    usages = [memory(pid) for pid in pids]
+    for name, (uss, pss) in zip(["master", *(f"worker {i}" for i in range(1, len(pids)))], usages):
+        click.echo(f"{name:<10} {uss:>8.1f} {pss:>8.1f}")
+    worker_uss = statistics.mean(uss for uss, _ in usages[1:])
+    total_pss = sum(pss for _, pss in usages)
+    click.echo(f"{'mean':<10} {worker_uss:>8.1f}")
+    click.echo(f"{'total':<10} {'':>8} {total_pss:>8.1f}")
+    return worker_uss
+
+
+@click.command(context_settings={"max_content_width": 100})
+@click.option("--workers", "-w", type=int, default=4, show_default=True, help="Number of gunicorn workers.")
+@click.option("--requests", "-n", type=int, default=1000, show_default=True, help="Number of requests per mode.")
+@click.option("--port", type=int, default=8100, show_default=True, help="Port to serve the app on.")
+def benchmark(workers, requests, port):
+    """Benchmark the memory used by each worker with and without preloading."""
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = pathlib.Path(directory) / "db.sqlite3"
+        info(f"Creating a database at {database_path}")
+        setup_django(database_path)
+        paths = asgi.create_data(items=50)
+
+        worker_uss = {}
+        for mode, preload in MODES.items():
+            info(f"Serving {requests} requests with the app {mode}")
+            env = app_env(database_path, GUNICORN_PRELOAD_APP=preload)
+            with gunicorn(env, port=port, args=["--workers", str(workers)]) as process:
+                # Make enough concurrent requests for every worker to handle
+                # some, so that they've all loaded everything that they need.
+                hammer(port, paths, concurrency=workers * 4, requests=requests)
+                worker_uss[mode] = report_memory(f"{mode}: {workers} workers", process.pid)
+
+        saved = worker_uss["not preloaded"] - worker_uss["preloaded"]
+        info(f"Preloading saves {saved:.1f} MiB per worker")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,103 @@
+"""
+Compare the latency of authenticated requests for a list page and the number
+of database queries that they make with each session engine.
+
+Usage: python -m benchmarks.sessions --help
+"""
+
+import pathlib
+import tempfile
+import threading
+import time
+from concurrent import futures
+
+import click
+
+from .common import (
+    Client,
+    Timings,
+    app_env,
+    gunicorn,
+    info,
+    report,
+    setup_django,
+)
+
+ENGINES = ("db", "cached_db", "cache", "signed_cookies")
+
+PASSWORD = "benchmark-password"
+
+
+def create_users(count):
+    """Create some users, each with a list. Return their emails and list URLs."""
+    from lists.models import List
+    from users.models import User
+
+    users = []
+    for i in range(count):
+        user = User(email=f"user{i}@example.com")
+        user.set_password(PASSWORD)
+        user.save()
+        users.append((user.email, List.create_new(f"item {i}", owner=user).get_absolute_url()))
+    return users
+
+
+def run(port, users, requests):
+    """
+    Log each user in and request their list page from a thread per user until
+    the given number of requests have been made. Return the timings, the
+    elapsed time and the mean number of database queries per request.
+    """
+    timings = Timings()
+    queries = []
+    queries_lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def browse(email, list_url):
+        client = Client(port, timings)
+        client.get("GET /login/", "/login/")
+        client.post("POST /login/", "/login/", {"username": email, "password": PASSWORD})
+        for _ in counter:
+            response = client.get("GET /lists/<pk>/", list_url)
+            with queries_lock:
+                queries.append(int(response.headers["X-DB-Queries"]))
+        client.close()
+
+    start = time.perf_counter()
+    with futures.ThreadPoolExecutor(len(users)) as executor:
+        for future in [executor.submit(browse, *user) for user in users]:
+            future.result()
+    return timings, time.perf_counter() - start, sum(queries) / len(queries)
+
+
+@click.command(context_settings={"max_content_width": 100})
+@click.option("--workers", "-w", type=int, default=2, show_default=True, help="Number of gunicorn workers.")
+@click.option("--users", "-c", type=int, default=8, show_default=True, help="Number of concurrent logged in users.")
+@click.option("--requests", "-n", type=int, default=2000, show_default=True, help="Number of requests per engine.")
+@click.option("--port", type=int, default=8100, show_default=True, help="Port to serve the app on.")
+def benchmark(workers, users, requests, port):
+    """Benchmark authenticated requests with each session engine."""
+    with tempfile.TemporaryDirectory() as directory:
+        directory = pathlib.Path(directory)
+        database_path = directory / "db.sqlite3"
+        info(f"Creating a database at {database_path}")
+        setup_django(database_path)
+        accounts = create_users(users)
+
+        for engine in ENGINES:
+            # The cache has to be shared between the workers for the cache
+            # backed engines to work.
+            env = app_env(
+                database_path,
+                SESSION_ENGINE=engine,
+                CACHE_URL=f"filecache://{directory / engine}",
+                DB_QUERY_HEADERS="true",
+            )
+            info(f"Benchmarking the {engine} session engine")
+            with gunicorn(env, port=port, args=["--workers", str(workers)]):
+                timings, elapsed, mean_queries = run(port, accounts, requests)
+            report(f"{engine}: {users} users, {mean_queries:.2f} queries per list page", timings, elapsed)
+
+
+if __name__ == "__main__":
+    benchmark()
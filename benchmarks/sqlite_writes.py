@@ -0,0 +1,71 @@
+"""
+Compare the write throughput of the app on SQLite with SQLite's default
+settings and with the tuned settings from superlists/settings.py, while other
+clients are reading the lists being written to.
+
+Usage: python -m benchmarks.sqlite_writes --help
+"""
+
+import os
+import pathlib
+import shutil
+import tempfile
+from concurrent import futures
+
+import click
+
+from . import item_add
+from .common import app_env, gunicorn, hammer, info, report, setup_django
+
+# The settings which SQLite and Python's sqlite3 module use if they aren't
+# changed.
+DEFAULT_SETTINGS = {
+    "SQLITE_JOURNAL_MODE": "delete",
+    "SQLITE_BUSY_TIMEOUT": "5000",
+    "SQLITE_SYNCHRONOUS": "full",
+    "SQLITE_MMAP_SIZE": "0",
+    "SQLITE_CACHE_SIZE": "-2000",
+    "SQLITE_TRANSACTION_MODE": "deferred",
+}
+
+CONFIGURATIONS = {"default": DEFAULT_SETTINGS, "tuned": {}}
+
+
+@click.command(context_settings={"max_content_width": 100})
+@click.option("--workers", "-w", type=int, default=4, show_default=True, help="Number of gunicorn workers.")
+@click.option("--writers", type=int, default=8, show_default=True, help="Number of lists added to at once.")
+@click.option("--readers", type=int, default=8, show_default=True, help="Number of concurrent readers of the lists.")
+@click.option("--requests", "-n", type=int, default=2000, show_default=True, help="Number of items to add.")
+@click.option("--port", type=int, default=8100, show_default=True, help="Port to serve the app on.")
+def benchmark(workers, writers, readers, requests, port):
+    """Benchmark concurrent writes to SQLite with default and tuned settings."""
+    with tempfile.TemporaryDirectory() as directory:
+        directory = pathlib.Path(directory)
+        template_path = directory / "template.sqlite3"
+        info(f"Creating a database at {template_path}")
+        # Leave the template in rollback journal mode so that each copy starts
+        # in the same state.
+        os.environ["SQLITE_JOURNAL_MODE"] = "delete"
+        setup_django(template_path)
+        list_urls = item_add.create_lists(writers)
+        del os.environ["SQLITE_JOURNAL_MODE"]
+
+        for name, settings in CONFIGURATIONS.items():
+            database_path = directory / f"{name}.sqlite3"
+            shutil.copy(template_path, database_path)
+            env = app_env(database_path, **settings)
+
+            info(f"Adding {requests} items with {name} settings")
+            with gunicorn(env, port=port, args=["--workers", str(workers)]):
+                with futures.ThreadPoolExecutor(2) as executor:
+                    writes = executor.submit(item_add.run, port, list_urls, requests, duplicates=0)
+                    reads = executor.submit(hammer, port, list_urls, readers, requests)
+                    write_timings, write_elapsed = writes.result()
+                    read_timings, read_elapsed = reads.result()
+
+            report(f"{name}: writes from {writers} clients", write_timings, write_elapsed)
+            report(f"{name}: reads from {readers} clients", read_timings, read_elapsed)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -195,7 +195,10 @@ def apply_migrations(c):
 
 
 def collect_static(c):
-    """Collecting the static files."""
+    """
+    Collect the static files, which hashes their names, purges the unused CSS
+    and saves compressed copies of them for nginx to serve.
+    """
     info("Collecting the static files")
     c.run("docker-compose run app python manage.py collectstatic --noinput")
 
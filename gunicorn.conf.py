@@ -1,5 +1,33 @@
 import multiprocessing
+import os
+
+# Values of GUNICORN_WORKER_CLASS mapped to the worker class and application
+# that they serve.
+WORKER_CLASSES = {
+    "sync": ("sync", "superlists.wsgi:application"),
+    "gthread": ("gthread", "superlists.wsgi:application"),
+    # UvicornWorker needs uvloop and httptools, which aren't installed.
+    "uvicorn": ("uvicorn.workers.UvicornH11Worker", "superlists.asgi:application"),
+}
+
+worker_class, wsgi_app = WORKER_CLASSES[os.environ.get("GUNICORN_WORKER_CLASS", "sync")]
 
 accesslog = "-"
 bind = "0.0.0.0:8000"
-workers = 2 * multiprocessing.cpu_count() + 1
+# Run python -m benchmarks.calibrate to find the values of these which give the
+# most throughput within a memory budget.
+workers = int(os.environ.get("GUNICORN_WORKERS", 2 * multiprocessing.cpu_count() + 1))
+# Only used by the gthread worker class.
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+
+# Import the app in the master before forking the workers, so that they share
+# its memory rather than each importing it themselves.
+preload_app = os.environ.get("GUNICORN_PRELOAD_APP", "true").lower() == "true"
+
+
+def when_ready(server):
+    """Warm up and freeze the preloaded app before the workers are forked."""
+    if server.cfg.preload_app:
+        from superlists.warmup import freeze
+
+        freeze()
@@ -0,0 +1,229 @@
+"""
+Version 1 of the JSON API, for programmatic clients.
+
+Requests and responses have JSON bodies. Errors are returned in the format of
+Form.errors.get_json_data(), under an "errors" key, with errors which don't
+belong to a field under "__all__".
+
+Clients are authenticated with the session cookie set by the login page, like
+the browser. CSRF only protects against requests that a browser sends with its
+cookies, so a CSRF token is only required from clients which are logged in.
+"""
+
+import functools
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.http import JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from superlists.db.routers import read_from_replica
+from users.models import User
+
+from . import pagination
+from .forms import ItemForm, NewListForm, ShareListForm
+from .models import Item, List
+
+
+def _error(message, code, status=400, field="__all__"):
+    return JsonResponse({"errors": {field: [{"message": message, "code": code}]}}, status=status)
+
+
+def _csrf_exempt_unless_logged_in(view):
+    """
+    Exempt a view from CSRF protection unless the user is logged in, in which
+    case the request has to have a CSRF token, as for any other view.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.user.is_authenticated:
+            middleware = CsrfViewMiddleware(lambda request: None)
+            if middleware.process_view(request, None, args, kwargs) is not None:
+                return _error("CSRF verification failed.", "csrf_failed", status=403)
+        return view(request, *args, **kwargs)
+
+    return csrf_exempt(wrapper)
+
+
+def _json_body(view):
+    """
+    Parse the JSON object in a request's body and pass it to a view as the
+    "data" argument.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return _error("The request body isn't valid JSON.", "invalid_json")
+        if not isinstance(data, dict):
+            return _error("The request body must be a JSON object.", "invalid_json")
+        return view(request, data, *args, **kwargs)
+
+    return wrapper
+
+
+def _with_list(view):
+    """
+    Get the list with the primary key in the URL, and its owner, and pass it
+    to a view instead of the key.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, pk, **kwargs):
+        list_ = List.objects.select_related("owner").filter(pk=pk).first()
+        if list_ is None:
+            return _error("This list doesn't exist.", "not_found", status=404)
+        return view(request, *args, list_=list_, **kwargs)
+
+    return wrapper
+
+
+def _list_json(list_):
+    return {
+        "id": list_.pk,
+        "url": reverse("api-v1:list", args=(list_.pk,)),
+        "name": list_.name,
+        "owner": list_.owner.email if list_.owner else None,
+        "item_count": list_.item_count,
+        "version": list_.version,
+    }
+
+
+def _item_json(item):
+    return {"id": item.pk, "text": item.text}
+
+
+def _page_json(request, page, key, to_json):
+    return {
+        key: [to_json(obj) for obj in page.items],
+        "next": f"{request.path}?{page.next_query}" if page.has_next else None,
+        "previous": f"{request.path}?{page.previous_query}" if page.has_previous else None,
+    }
+
+
+@require_POST
+@_csrf_exempt_unless_logged_in
+@_json_body
+def create_list(request, data):
+    """Create a list from its first item's text, owned by the user if logged in."""
+    form = NewListForm(data=data)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+    list_ = form.save(owner=request.user)
+    return JsonResponse(_list_json(list_), status=201)
+
+
+@require_GET
+@read_from_replica
+@_with_list
+def view_list(request, list_):
+    """Return a list, its sharees and a page of its items."""
+    page = pagination.KeysetPage(list_.items.all(), settings.LIST_PAGE_SIZE, request.GET)
+    shared_with = list(list_.shared_with.order_by("email").values_list("email", flat=True))
+    return JsonResponse(
+        {**_list_json(list_), "shared_with": shared_with, **_page_json(request, page, "items", _item_json)}
+    )
+
+
+@require_POST
+@_csrf_exempt_unless_logged_in
+@_json_body
+@_with_list
+def add_item(request, data, list_):
+    """Add an item to a list."""
+    form = ItemForm(data=data, list_=list_)
+    item = form.save() if form.is_valid() else None
+    if item is None:
+        return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+    return JsonResponse(_item_json(item), status=201)
+
+
+@require_POST
+@_csrf_exempt_unless_logged_in
+@_json_body
+@_with_list
+def add_items(request, data, list_):
+    """
+    Add the items whose texts are in the "items" array to a list, in a single
+    transaction. Each text is validated by ItemForm, and texts which are
+    already in the list (or earlier in the array) are duplicates. If any of
+    the texts are invalid, none of them are added and the errors of each one
+    are returned under its index in the array.
+    """
+    texts = data.get("items")
+    if not isinstance(texts, list) or not texts:
+        return _error("Enter a non-empty array of item texts.", "invalid", field="items")
+    if len(texts) > settings.API_BATCH_LIMIT:
+        return _error(
+            f"Add at most {settings.API_BATCH_LIMIT} items at a time.", "too_many_items", status=413, field="items"
+        )
+
+    forms = [ItemForm(data={"text": text}, list_=list_) for text in texts]
+    errors = {index: form.errors.get_json_data() for index, form in enumerate(forms) if not form.is_valid()}
+    if errors:
+        return JsonResponse({"errors": {"items": errors}}, status=400)
+
+    texts = [form.cleaned_data["text"] for form in forms]
+    duplicate = ItemForm.Meta.error_messages["text"]["unique"]
+    seen = set()
+    # SQLite limits the number of parameters in a query, one of which is the
+    # list's, so look the texts up in chunks.
+    chunk_size = (connection.features.max_query_params or len(texts) + 1) - 1
+    for start in range(0, len(texts), chunk_size):
+        end = start + chunk_size
+        seen.update(Item.objects.filter(list=list_, text__in=texts[start:end]).values_list("text", flat=True))
+    for index, text in enumerate(texts):
+        if text in seen:
+            errors[index] = {"text": [{"message": duplicate, "code": "unique"}]}
+        seen.add(text)
+    if errors:
+        return JsonResponse({"errors": {"items": errors}}, status=400)
+
+    try:
+        with transaction.atomic():
+            Item.objects.bulk_create([Item(text=text, list=list_) for text in texts])
+    except IntegrityError:
+        # Another request added one of the items since we checked.
+        return _error(duplicate, "unique", status=409, field="items")
+    return JsonResponse({"added": len(texts), "url": reverse("api-v1:list", args=(list_.pk,))}, status=201)
+
+
+@require_POST
+@_csrf_exempt_unless_logged_in
+@_json_body
+@_with_list
+def share_list(request, data, list_):
+    """
+    Share a list with the users whose emails are in the "sharees" array or
+    the "sharee" string, separated as in the share form.
+    """
+    if not request.user.is_authenticated:
+        return _error("Log in to share lists.", "not_authenticated", status=403)
+    if isinstance(data.get("sharees"), list):
+        data = {"sharee": ", ".join(str(email) for email in data["sharees"])}
+
+    form = ShareListForm(data=data, list_id=list_.pk, sharer=request.user)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+    form.save()
+    return JsonResponse({"shared_with": [user.email for user in form.cleaned_data["sharee"]]})
+
+
+@require_GET
+@read_from_replica
+def my_lists(request, email):
+    """Return a page of the lists which a user owns or which have been shared with them."""
+    try:
+        owner = User.objects.get_by_natural_key(email)
+    except User.DoesNotExist:
+        return _error("This user doesn't exist.", "not_found", status=404)
+    lists = List.objects.visible_to(owner).select_related("owner")
+    page = pagination.KeysetPage(lists, settings.LIST_PAGE_SIZE, request.GET)
+    return JsonResponse({"owner": owner.email, **_page_json(request, page, "lists", _list_json)})
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import api
+
+app_name = "api-v1"
+urlpatterns = [
+    path("lists/", api.create_list, name="create-list"),
+    path("lists/<int:pk>/", api.view_list, name="list"),
+    path("lists/<int:pk>/items/", api.add_item, name="add-item"),
+    path("lists/<int:pk>/items/batch/", api.add_items, name="add-items"),
+    path("lists/<int:pk>/share/", api.share_list, name="share-list"),
+    path("users/<str:email>/lists/", api.my_lists, name="my-lists"),
+]
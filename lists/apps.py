@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, pre_delete
 
 
 class ListsConfig(AppConfig):
     name = "lists"
+
+    def ready(self):
+        from users.models import User
+
+        from .models import touch_lists_of_deleted_user, touch_lists_of_saved_user
+
+        post_save.connect(touch_lists_of_saved_user, sender=User)
+        pre_delete.connect(touch_lists_of_deleted_user, sender=User)
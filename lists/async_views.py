@@ -0,0 +1,42 @@
+"""
+Async versions of the views which are used when the app is served over ASGI.
+
+The ORM and template rendering are synchronous, so each view runs its sync
+counterpart in a thread from the event loop's executor. Only one thread is
+used per request, and other requests are handled while it waits on the
+database.
+"""
+
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from superlists.db import health
+
+from . import views
+
+
+def _async_view(view):
+    """Return an async version of a sync view."""
+
+    def run_view(*args, **kwargs):
+        # Executor threads aren't closed between requests like the main thread
+        # is, so clean up their connections in the same way.
+        close_old_connections()
+        health.check_connections()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    @functools.wraps(view)
+    async def async_view(*args, **kwargs):
+        return await sync_to_async(run_view, thread_sensitive=False)(*args, **kwargs)
+
+    return async_view
+
+
+home_page = _async_view(views.home_page)
+view_list = _async_view(views.view_list)
+my_lists = _async_view(views.my_lists)
@@ -0,0 +1,63 @@
+import csv
+import json
+
+from .imports import CSV, NDJSON
+
+CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {CSV: "text/csv", NDJSON: "application/x-ndjson"}
+
+
+class _Echo:
+    """A file-like object which returns what's written to it."""
+
+    def write(self, value):
+        return value
+
+
+def _item_texts(list_):
+    """
+    Iterate over the texts of a list's items, fetching CHUNK_SIZE of them at a
+    time from the database.
+    """
+    return list_.items.order_by("pk").values_list("text", flat=True).iterator(chunk_size=CHUNK_SIZE)
+
+
+def metadata(list_):
+    """Return the owner and sharees of a list."""
+    return {
+        "list": list_.pk,
+        "name": list_.name,
+        "owner": list_.owner.email if list_.owner else None,
+        "shared_with": list(list_.shared_with.order_by("email").values_list("email", flat=True)),
+    }
+
+
+def export_csv(list_):
+    """
+    Yield the lines of a CSV file with a "text" column which contains the text
+    of each of a list's items.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(["text"])
+    for text in _item_texts(list_):
+        yield writer.writerow([text])
+
+
+def export_ndjson(list_):
+    """
+    Yield the lines of an NDJSON file. The first line is an object containing
+    the list's metadata and each line after that is an object containing the
+    text of one of its items.
+    """
+    yield json.dumps(metadata(list_)) + "\n"
+    for text in _item_texts(list_):
+        yield json.dumps({"text": text}) + "\n"
+
+
+EXPORTERS = {CSV: export_csv, NDJSON: export_ndjson}
+
+
+def export(list_, format):
+    """Yield the lines of an export of a list in the given format."""
+    return EXPORTERS[format](list_)
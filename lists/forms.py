@@ -1,10 +1,16 @@
+import re
+
 from django import forms
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 
 from users.models import User
 
+from . import imports
 from .models import Item, List
 
+EMAIL_SEPARATORS = re.compile(r"[\s,;]+")
+
 
 class PlaceholdersMixin:
     """
@@ -37,23 +43,27 @@ class ItemForm(PlaceholdersMixin, forms.ModelForm):
     def save(self, commit=True):
         """
         Create a list if the internal instance doesn't already have one set.
+
+        The list's unique constraint is relied on to reject duplicate items
+        rather than checking for them beforehand, which would cost an extra
+        query for every item and could race with another request. If the item
+        is a duplicate, add an error to the text field and return None.
         """
         if self.instance.list_id is None:
             self.instance.list = List.objects.create()
-        return super().save(commit=commit)
-
-    def clean_text(self):
-        """
-        Check for items in the same list with the same list text if the
-        internal instance has a list set.
-        """
-        if (
-            self.instance.list_id is None
-            or not Item.objects.filter(text=self.cleaned_data["text"], list=self.instance.list).exists()
-        ):
-            return self.cleaned_data["text"]
-        else:
+        if not commit:
+            return super().save(commit=False)
+
+        try:
+            # The savepoint means that the failed insert doesn't break any
+            # transaction that the item is being saved in.
+            with transaction.atomic():
+                return super().save()
+        except IntegrityError:
+            if not Item.objects.filter(text=self.instance.text, list_id=self.instance.list_id).exists():
+                raise
             self._update_errors(ValidationError({"text": ValidationError("Text is not unique", code="unique")}))
+            return None
 
 
 class NewListForm(ItemForm):
@@ -65,10 +75,15 @@ class NewListForm(ItemForm):
 
 
 class ShareListForm(PlaceholdersMixin, forms.Form):
+    """
+    Shares a list with the users whose emails are entered in the sharee field,
+    separated by commas, semicolons or whitespace.
+    """
+
     sharee = forms.CharField()
 
     class Meta:
-        placeholders = {"sharee": "your-friend@example.com"}
+        placeholders = {"sharee": "your-friend@example.com, another-friend@example.com"}
 
     def __init__(self, *args, list_id=None, sharer=None, **kwargs):
         super().__init__(*args, **kwargs)
@@ -76,15 +91,55 @@ class ShareListForm(PlaceholdersMixin, forms.Form):
         self._sharer = sharer
 
     def save(self):
-        return List.objects.share_list(sharee=self.cleaned_data["sharee"], list_id=self._list_id)
+        return List.objects.share_list(sharees=self.cleaned_data["sharee"], list_id=self._list_id)
 
     @property
     def list(self):
         return List.objects.get(pk=self._list_id)
 
     def clean_sharee(self):
-        if not User.objects.exists_with_email(self.cleaned_data["sharee"]):
-            raise ValidationError("This user doesn't have an account.", code="no_account")
-        elif self.cleaned_data["sharee"] == self._sharer.email:
-            raise ValidationError("You already own this list.", code="sharer_owns_list")
-        return self.cleaned_data["sharee"]
+        """
+        Return the users with the entered emails, which are looked up in a
+        single query. Each email which the list can't be shared with gets its
+        own error.
+        """
+        emails = EMAIL_SEPARATORS.split(User.objects.normalize_email(self.cleaned_data["sharee"]))
+        emails = list(dict.fromkeys(email for email in emails if email))
+        if not emails:
+            raise ValidationError(self.fields["sharee"].error_messages["required"], code="required")
+
+        users = User.objects.in_bulk(emails, field_name="email")
+        errors = []
+        for email in emails:
+            if email == self._sharer.email:
+                errors.append(ValidationError("You already own this list.", code="sharer_owns_list"))
+            elif email not in users:
+                errors.append(
+                    ValidationError("%(email)s doesn't have an account.", code="no_account", params={"email": email})
+                )
+        if errors:
+            raise ValidationError(errors)
+        return [users[email] for email in emails]
+
+
+class ImportItemsForm(forms.Form):
+    file = forms.FileField()
+    format = forms.ChoiceField(choices=[(format, format) for format in imports.FORMATS], required=False)
+
+    def clean(self):
+        """
+        Infer the format from the file's extension if it hasn't been given.
+        """
+        cleaned_data = super().clean()
+        if "file" in cleaned_data and not cleaned_data.get("format"):
+            cleaned_data["format"] = imports.format_from_filename(cleaned_data["file"].name)
+            if cleaned_data["format"] is None:
+                raise ValidationError(
+                    "The format of this file couldn't be determined from its name.", code="unknown_format"
+                )
+        return cleaned_data
+
+    def save(self, list_):
+        lines = (line.decode("utf-8-sig", errors="replace") for line in self.cleaned_data["file"])
+        texts = imports.parse(lines, self.cleaned_data["format"])
+        return imports.import_items(list_, texts)
@@ -0,0 +1,115 @@
+import collections
+import csv
+import itertools
+import json
+import os
+
+from django.db import IntegrityError, transaction
+
+from .models import Item
+
+CSV = "csv"
+NDJSON = "ndjson"
+FORMATS = (CSV, NDJSON)
+
+EXTENSIONS = {".csv": CSV, ".ndjson": NDJSON, ".jsonl": NDJSON}
+
+DEFAULT_BATCH_SIZE = 500
+
+ImportResult = collections.namedtuple("ImportResult", ("accepted", "duplicates", "rejected"))
+
+
+def format_from_filename(filename):
+    """Return the import format implied by a filename's extension, or None."""
+    _, extension = os.path.splitext(filename)
+    return EXTENSIONS.get(extension.lower())
+
+
+def parse_csv(lines):
+    """
+    Yield the text in the first column of each row of some CSV lines. A header
+    row of "text" is skipped, as are blank rows. Rows without any text yield
+    None.
+    """
+    reader = csv.reader(lines)
+    for row in reader:
+        if not row:
+            continue
+        elif reader.line_num == 1 and row[0].strip().lower() == "text":
+            continue
+        yield row[0]
+
+
+def parse_ndjson(lines):
+    """
+    Yield the text of each line of some NDJSON lines. Each line can either be a
+    string or an object with a "text" key. Blank lines are skipped and lines
+    which can't be parsed yield None.
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+
+        try:
+            value = json.loads(line)
+        except ValueError:
+            yield None
+            continue
+
+        if isinstance(value, dict):
+            value = value.get("text")
+        yield value if isinstance(value, str) else None
+
+
+PARSERS = {CSV: parse_csv, NDJSON: parse_ndjson}
+
+
+def parse(lines, format):
+    """Yield the item texts in some lines of the given format."""
+    return PARSERS[format](lines)
+
+
+def import_items(list_, texts, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Import some item texts into a list, a batch at a time. Empty texts are
+    rejected and texts which are already in the list (or earlier in the same
+    batch) are counted as duplicates, with one query per batch to find them.
+    """
+    accepted = duplicates = rejected = 0
+
+    texts = iter(texts)
+    while True:
+        batch = list(itertools.islice(texts, batch_size))
+        if not batch:
+            break
+
+        # A dict rather than a set so that items keep their import order.
+        unique_texts = {}
+        for text in batch:
+            text = text.strip() if text is not None else ""
+            if not text:
+                rejected += 1
+            elif text in unique_texts:
+                duplicates += 1
+            else:
+                unique_texts[text] = None
+
+        while True:
+            try:
+                with transaction.atomic():
+                    existing_texts = set(
+                        Item.objects.filter(list=list_, text__in=unique_texts).values_list("text", flat=True)
+                    )
+                    new_items = [Item(text=text, list=list_) for text in unique_texts if text not in existing_texts]
+                    Item.objects.bulk_create(new_items)
+                break
+            except IntegrityError:
+                # Another request added some of the items since we looked for
+                # them. Look again rather than ignoring the conflicts, so that
+                # they're counted as duplicates rather than as accepted.
+                pass
+
+        accepted += len(new_items)
+        duplicates += len(existing_texts)
+
+    return ImportResult(accepted=accepted, duplicates=duplicates, rejected=rejected)
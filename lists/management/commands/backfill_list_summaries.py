@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from lists.models import List
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Recalculate the denormalised name and item count of every list."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Number of lists to update at a time. Defaults to {DEFAULT_BATCH_SIZE}.",
+        )
+
+    def handle(self, batch_size, **options):
+        list_pks = List.objects.order_by("pk").values_list("pk", flat=True)
+        updated = 0
+        last_pk = 0
+        # Walk the lists in primary key ranges rather than with OFFSET so that
+        # each batch costs the same however far through the table it is.
+        while True:
+            batch = list(list_pks.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            updated += List.objects.filter(pk__gt=last_pk, pk__lte=batch[-1]).refresh_summaries()
+            last_pk = batch[-1]
+
+        self.stdout.write(f"Updated {updated} lists.")
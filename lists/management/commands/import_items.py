@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lists import imports
+from lists.models import List
+
+
+class Command(BaseCommand):
+    help = "Import items into a list from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("list_id", type=int, help="ID of the list to import the items into.")
+        parser.add_argument("path", help='Path of the file to import, or "-" to read from stdin.')
+        parser.add_argument(
+            "--format", choices=imports.FORMATS, help="Format of the file. Inferred from its extension by default."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=imports.DEFAULT_BATCH_SIZE,
+            help=f"Number of items to insert at a time. Defaults to {imports.DEFAULT_BATCH_SIZE}.",
+        )
+
+    def handle(self, list_id, path, format, batch_size, **options):
+        try:
+            list_ = List.objects.get(pk=list_id)
+        except List.DoesNotExist:
+            raise CommandError(f"List {list_id} doesn't exist.")
+
+        if format is None:
+            format = imports.format_from_filename(path)
+            if format is None:
+                raise CommandError(f"The format of {path} couldn't be determined, set it with --format.")
+
+        if path == "-":
+            result = imports.import_items(list_, imports.parse(sys.stdin, format), batch_size=batch_size)
+        else:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                result = imports.import_items(list_, imports.parse(f, format), batch_size=batch_size)
+
+        self.stdout.write(f"Accepted {result.accepted}, duplicates {result.duplicates}, rejected {result.rejected}.")
@@ -0,0 +1,77 @@
+import argparse
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from lists import seeding
+
+
+def distribution(spec):
+    try:
+        return seeding.distribution(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users with lists of items shared with each other, for benchmarking against a large database. "
+        "Distributions are N, constant:N, uniform:LOW:HIGH, poisson:MEAN or exponential:MEAN."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Number of users to create. Defaults to 1000.")
+        parser.add_argument(
+            "--lists-per-user",
+            type=distribution,
+            default="poisson:3",
+            help="Distribution of the number of lists per user. Defaults to poisson:3.",
+        )
+        parser.add_argument(
+            "--items-per-list",
+            type=distribution,
+            default="exponential:20",
+            help="Distribution of the number of items per list. Defaults to exponential:20.",
+        )
+        parser.add_argument(
+            "--shares-per-list",
+            type=distribution,
+            default="poisson:1",
+            help="Distribution of the number of users each list is shared with. Defaults to poisson:1.",
+        )
+        parser.add_argument(
+            "--password", default="password", help='Password of every created user. Defaults to "password".'
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=seeding.DEFAULT_BATCH_SIZE,
+            help=f"Number of rows to insert at a time. Defaults to {seeding.DEFAULT_BATCH_SIZE}.",
+        )
+        parser.add_argument("--seed", type=int, help="Seed of the random number generator.")
+
+    def handle(self, users, lists_per_user, items_per_list, shares_per_list, password, batch_size, seed, **options):
+        start = time.perf_counter()
+
+        def progress(totals):
+            if options["verbosity"] > 1:
+                self.stdout.write(self._summary(totals, time.perf_counter() - start))
+
+        result = seeding.seed(
+            users,
+            lists_per_user,
+            items_per_list,
+            shares_per_list,
+            password=password,
+            batch_size=batch_size,
+            rng=random.Random(seed),
+            progress=progress,
+        )
+        self.stdout.write(self._summary(result, time.perf_counter() - start))
+
+    def _summary(self, result, elapsed):
+        return (
+            f"Created {result.users} users, {result.lists} lists, {result.items} items and {result.shares} shares "
+            f"in {elapsed:.1f}s."
+        )
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+
+class Command(BaseCommand):
+    help = (
+        "Checkpoint the write-ahead log of an SQLite database into the database file and let SQLite update its query "
+        "planner statistics. Run it periodically, or pass --interval to keep running it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS, help=f'Database to maintain. Defaults to "{DEFAULT_DB_ALIAS}".'
+        )
+        parser.add_argument(
+            "--checkpoint-mode",
+            choices=CHECKPOINT_MODES,
+            type=str.upper,
+            default="TRUNCATE",
+            help="Mode of the WAL checkpoint. Defaults to TRUNCATE, which also truncates the WAL file.",
+        )
+        parser.add_argument(
+            "--interval", type=float, help="Run the maintenance every this many seconds until interrupted."
+        )
+
+    def handle(self, database, checkpoint_mode, interval, **options):
+        if connections[database].vendor != "sqlite":
+            raise CommandError(f'The "{database}" database isn\'t an SQLite database.')
+
+        while True:
+            self.maintain(connections[database], checkpoint_mode)
+            if interval is None:
+                break
+            # Don't hold the connection open while sleeping.
+            connections[database].close()
+            time.sleep(interval)
+
+    def maintain(self, connection, checkpoint_mode):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA wal_checkpoint({checkpoint_mode})")
+            busy, log_pages, checkpointed_pages = cursor.fetchone()
+            cursor.execute("PRAGMA optimize")
+
+        if busy:
+            self.stdout.write("The checkpoint couldn't complete because the database was busy.")
+        elif log_pages == -1:
+            self.stdout.write("The database isn't in WAL mode, so there was nothing to checkpoint.")
+        else:
+            self.stdout.write(f"Checkpointed {checkpointed_pages} of {log_pages} WAL pages.")
+        self.stdout.write("Optimized the database.")
@@ -0,0 +1,17 @@
+# Generated by Django 3.1 on 2026-10-18 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lists", "0009_auto_20200728_1133"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="list", name="item_count", field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(model_name="list", name="name", field=models.TextField(default="", editable=False),),
+    ]
@@ -0,0 +1,14 @@
+# Generated by Django 3.1 on 2026-10-18 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lists", "0010_list_summaries"),
+    ]
+
+    operations = [
+        migrations.AddIndex(model_name="item", index=models.Index(fields=["list", "id"], name="item_list_id_idx"),),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 3.1 on 2026-10-18 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lists", "0011_item_list_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="list", name="version", field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
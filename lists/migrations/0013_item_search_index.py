@@ -0,0 +1,64 @@
+from django.db import migrations
+
+# The FTS5 table indexes the items' text without storing a copy of it and is
+# kept in sync by triggers, so that every way of writing items (including bulk
+# inserts, updates and deletes) updates it.
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE lists_item_fts USING fts5(
+        text, content='lists_item', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_insert AFTER INSERT ON lists_item BEGIN
+        INSERT INTO lists_item_fts (rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_delete AFTER DELETE ON lists_item BEGIN
+        INSERT INTO lists_item_fts (lists_item_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_update AFTER UPDATE OF text ON lists_item BEGIN
+        INSERT INTO lists_item_fts (lists_item_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO lists_item_fts (rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    "INSERT INTO lists_item_fts (lists_item_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER lists_item_fts_update",
+    "DROP TRIGGER lists_item_fts_delete",
+    "DROP TRIGGER lists_item_fts_insert",
+    "DROP TABLE lists_item_fts",
+]
+
+POSTGRESQL_FORWARDS = [
+    "CREATE INDEX lists_item_text_search_idx ON lists_item USING GIN (to_tsvector('english', text))",
+]
+POSTGRESQL_BACKWARDS = [
+    "DROP INDEX lists_item_text_search_idx",
+]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement, params=None)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lists", "0012_list_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor({"sqlite": SQLITE_FORWARDS, "postgresql": POSTGRESQL_FORWARDS}),
+            run_for_vendor({"sqlite": SQLITE_BACKWARDS, "postgresql": POSTGRESQL_BACKWARDS}),
+        ),
+    ]
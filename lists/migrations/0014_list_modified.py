@@ -0,0 +1,17 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lists", "0013_item_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="list",
+            name="modified",
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -1,20 +1,66 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.shortcuts import reverse
+from django.utils import timezone
 
 from users.models import User
 
 
-class ListManager(models.Manager):
-    def share_list(self, sharee, list_id):
-        user = User.objects.get(email=sharee)
+class ListQuerySet(models.QuerySet):
+    def refresh_summaries(self):
+        """
+        Recalculate the name and item count of each list from its items and
+        bump its version and modification time, in a single query.
+        """
+        items = Item.objects.filter(list=OuterRef("pk")).order_by()
+        first_item_text = items.order_by("pk").values("text")[:1]
+        item_count = items.values("list").annotate(count=Count("pk")).values("count")
+        return self.update(
+            name=Coalesce(Subquery(first_item_text), Value("")),
+            item_count=Coalesce(Subquery(item_count), Value(0)),
+            version=F("version") + 1,
+            modified=timezone.now(),
+        )
+
+    def touch(self):
+        """Bump the version and modification time of each list."""
+        return self.update(version=F("version") + 1, modified=timezone.now())
+
+
+class ListManager(models.Manager.from_queryset(ListQuerySet)):
+    def visible_to(self, user):
+        """
+        Return the lists which a user owns or which have been shared with them,
+        unordered, in a single query. The shared lists are found with a
+        subquery rather than a join so that each list only appears once.
+        """
+        shared_list_ids = List.shared_with.through.objects.filter(user=user).values("list_id")
+        return self.filter(Q(owner=user) | Q(pk__in=shared_list_ids))
+
+    def share_list(self, sharees, list_id):
+        """
+        Share a list with some users, adding them all in a single insert, and
+        bump its version and modification time.
+        """
         list_ = self.get(pk=list_id)
-        list_.shared_with.add(user)
+        with transaction.atomic():
+            list_.shared_with.add(*sharees)
+            self.filter(pk=list_id).update(version=F("version") + 1, modified=timezone.now())
         return list_
 
 
 class List(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name="lists")
     shared_with = models.ManyToManyField(User, related_name="shared_lists")
+    # Denormalised from the list's items so that lists can be displayed without
+    # querying them. Kept up to date by Item and ItemQuerySet.
+    name = models.TextField(default="", editable=False)
+    item_count = models.PositiveIntegerField(default=0, editable=False)
+    # Incremented whenever the list's items or sharees change.
+    version = models.PositiveIntegerField(default=0, editable=False)
+    # Updated along with version, for Last-Modified headers.
+    modified = models.DateTimeField(default=timezone.now, editable=False)
 
     objects = ListManager()
 
@@ -27,14 +73,79 @@ class List(models.Model):
         Item.objects.create(text=first_item_text, list=list_)
         return list_
 
-    @property
-    def name(self):
-        return self.items.first().text
+
+class ItemQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, refresh_summaries=True, **kwargs):
+        """
+        Pass refresh_summaries=False to skip updating the lists' names, item
+        counts and versions, if they're already correct.
+        """
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if refresh_summaries:
+            List.objects.filter(pk__in={item.list_id for item in objs}).refresh_summaries()
+        return objs
+
+    def delete(self):
+        list_ids = set(self.order_by().values_list("list_id", flat=True).distinct())
+        result = super().delete()
+        List.objects.filter(pk__in=list_ids).refresh_summaries()
+        return result
 
 
 class Item(models.Model):
     text = models.TextField(default="")
     list = models.ForeignKey(List, on_delete=models.CASCADE, default=None, related_name="items")
 
+    objects = ItemQuerySet.as_manager()
+
     class Meta:
         constraints = [models.UniqueConstraint(fields=["text", "list"], name="unique_text_list")]
+        indexes = [models.Index(fields=["list", "id"], name="item_list_id_idx")]
+
+    def save(self, *args, **kwargs):
+        """
+        Update the list's name, item count, version and modification time
+        when a new item is saved.
+        """
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            return
+
+        modified = timezone.now()
+        List.objects.filter(pk=self.list_id).update(
+            name=Case(When(item_count=0, then=Value(self.text)), default=F("name")),
+            item_count=F("item_count") + 1,
+            version=F("version") + 1,
+            modified=modified,
+        )
+        if self._meta.get_field("list").is_cached(self):
+            if self.list.item_count == 0:
+                self.list.name = self.text
+            self.list.item_count += 1
+            self.list.version += 1
+            self.list.modified = modified
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        List.objects.filter(pk=self.list_id).refresh_summaries()
+        return result
+
+
+def touch_lists_of_saved_user(sender, instance, created, update_fields, **kwargs):
+    """
+    Bump the versions of the lists visible to a user when they're saved, as
+    the cached fragments of the lists show their email. Saves which only
+    update other fields, like the one which records logins, are skipped.
+    """
+    if created or (update_fields is not None and "email" not in update_fields):
+        return
+    List.objects.visible_to(instance).touch()
+
+
+def touch_lists_of_deleted_user(sender, instance, **kwargs):
+    """
+    Bump the versions of the lists visible to a user before they're deleted,
+    while the lists shared with them can still be found.
+    """
+    List.objects.visible_to(instance).touch()
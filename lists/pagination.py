@@ -0,0 +1,131 @@
+from urllib.parse import urlencode
+
+from django.utils.functional import cached_property
+
+
+def _int_param(params, name):
+    """Return a query parameter as a positive int, or None if it isn't one."""
+    try:
+        value = int(params.get(name, ""))
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+class KeysetPage:
+    """
+    A page of items which is found by seeking past the ID of the last item on
+    the previous page (or before the first item on the next page), rather than
+    with an OFFSET, so that every page costs the same to fetch.
+
+    The position of the first item on the page is carried along in the query
+    string with the ID so that items can be numbered without counting the
+    items before them.
+    """
+
+    def __init__(self, queryset, page_size, params):
+        self._queryset = queryset
+        self.page_size = page_size
+        self._after = _int_param(params, "after")
+        self._before = _int_param(params, "before") if self._after is None else None
+        self.start = _int_param(params, "start") or 1
+
+    @property
+    def cursor(self):
+        """A string which identifies the page, for use in cache keys."""
+        return f"{self.page_size}:{self._after}:{self._before}:{self.start}"
+
+    @cached_property
+    def _rows(self):
+        """
+        The items on the page plus one more, which tells us whether there's
+        another page in the direction that we're paging.
+        """
+        if self._before is not None:
+            rows = list(self._queryset.filter(pk__lt=self._before).order_by("-pk")[: self.page_size + 1])
+            rows.reverse()
+            return rows
+        elif self._after is not None:
+            return list(self._queryset.filter(pk__gt=self._after).order_by("pk")[: self.page_size + 1])
+        else:
+            return list(self._queryset.order_by("pk")[: self.page_size + 1])
+
+    @cached_property
+    def items(self):
+        if self._before is not None:
+            return self._rows[1:] if len(self._rows) > self.page_size else self._rows
+        return self._rows[: self.page_size]
+
+    @cached_property
+    def has_next(self):
+        if self._before is not None:
+            # Fetching backwards doesn't tell us whether there's anything
+            # after the page, as the cursor might be past the last item.
+            return bool(self.items) and self._queryset.filter(pk__gt=self.items[-1].pk).exists()
+        return len(self._rows) > self.page_size
+
+    @property
+    def has_previous(self):
+        if self._before is not None:
+            return len(self._rows) > self.page_size
+        return self._after is not None
+
+    @property
+    def next_query(self):
+        return urlencode({"after": self.items[-1].pk, "start": self.start + len(self.items)})
+
+    @property
+    def previous_query(self):
+        # A page after the last item has no items, so page back from its
+        # cursor instead.
+        before = self.items[0].pk if self.items else self._after + 1
+        return urlencode({"before": before, "start": max(self.start - self.page_size, 1)})
+
+
+class OffsetPage:
+    """
+    A page of results which is found with an OFFSET, for results which aren't
+    ordered by a column that can be seeked past, like search results ordered
+    by rank. fetch is called with a limit and an offset and returns a list of
+    results. extra_params are included in the query strings of the other pages.
+    """
+
+    def __init__(self, fetch, page_size, params, extra_params=None):
+        self._fetch = fetch
+        self.page_size = page_size
+        self.number = _int_param(params, "page") or 1
+        self.start = (self.number - 1) * page_size + 1
+        self._extra_params = extra_params or {}
+
+    @cached_property
+    def _rows(self):
+        """
+        The results on the page plus one more, which tells us whether there's
+        a next page.
+        """
+        return self._fetch(self.page_size + 1, self.start - 1)
+
+    @cached_property
+    def items(self):
+        return self._rows[: self.page_size]
+
+    @property
+    def has_next(self):
+        return len(self._rows) > self.page_size
+
+    @property
+    def has_previous(self):
+        return self.number > 1
+
+    @property
+    def next_query(self):
+        return urlencode({**self._extra_params, "page": self.number + 1})
+
+    @property
+    def previous_query(self):
+        return urlencode({**self._extra_params, "page": self.number - 1})
+
+
+def last_page_query(last_item_pk, item_count, page_size):
+    """Return the query string of the page which ends with the last item."""
+    return urlencode({"before": last_item_pk + 1, "start": max(item_count - page_size + 1, 1)})
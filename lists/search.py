@@ -0,0 +1,86 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Item
+from .pagination import OffsetPage
+
+# Items in lists that the user owns or that have been shared with them.
+VISIBLE_TO_USER_SQL = """
+    (lists_list.owner_id = %s OR lists_list.id IN (
+        SELECT list_id FROM lists_list_shared_with WHERE user_id = %s
+    ))
+"""
+
+SQLITE_SQL = f"""
+    SELECT lists_item.*, bm25(lists_item_fts) AS rank
+    FROM lists_item_fts
+    INNER JOIN lists_item ON lists_item.id = lists_item_fts.rowid
+    INNER JOIN lists_list ON lists_list.id = lists_item.list_id
+    WHERE lists_item_fts MATCH %s AND {VISIBLE_TO_USER_SQL}
+    ORDER BY rank, lists_item.id
+    LIMIT %s OFFSET %s
+"""
+
+# The to_tsvector() expression must match the one in the GIN index for the
+# index to be used.
+POSTGRESQL_SQL = f"""
+    SELECT lists_item.*, ts_rank(to_tsvector('english', lists_item.text), query) AS rank
+    FROM lists_item
+    INNER JOIN lists_list ON lists_list.id = lists_item.list_id
+    CROSS JOIN to_tsquery('english', %s) query
+    WHERE to_tsvector('english', lists_item.text) @@ query AND {VISIBLE_TO_USER_SQL}
+    ORDER BY rank DESC, lists_item.id
+    LIMIT %s OFFSET %s
+"""
+
+
+def parse_terms(text):
+    """Return the words in some search text, lowercased."""
+    return re.findall(r"\w+", text.lower())
+
+
+def sqlite_query(terms):
+    """
+    Return an FTS5 query which matches all of some terms, treating the last one
+    as a prefix so that results appear while it's being typed.
+    """
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def postgresql_query(terms):
+    """
+    Return a tsquery which matches all of some terms, treating the last one as
+    a prefix.
+    """
+    return " & ".join(terms) + ":*"
+
+
+def _search(user, terms, limit, offset):
+    if connection.vendor == "sqlite":
+        params = [sqlite_query(terms), user.pk, user.pk, limit, offset]
+        return list(Item.objects.raw(SQLITE_SQL, params).prefetch_related("list"))
+    elif connection.vendor == "postgresql":
+        params = [postgresql_query(terms), user.pk, user.pk, limit, offset]
+        return list(Item.objects.raw(POSTGRESQL_SQL, params).prefetch_related("list"))
+
+    # Other backends don't have a full text index, so scan the user's items.
+    items = Item.objects.filter(Q(list__owner=user) | Q(list__in=user.shared_lists.values("pk")))
+    for term in terms:
+        items = items.filter(text__icontains=term)
+    return list(items.select_related("list").order_by("list_id", "pk")[offset:][:limit])
+
+
+def search_items(user, text, page_size, params):
+    """
+    Return a page of the items in the lists that a user owns or that have been
+    shared with them which contain all of the words in some text, best matches
+    first. The page is chosen by the "page" query parameter in params.
+    """
+    terms = parse_terms(text)
+
+    def fetch(limit, offset):
+        return _search(user, terms, limit, offset) if terms else []
+
+    return OffsetPage(fetch, page_size, params, extra_params={"q": text})
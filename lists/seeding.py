@@ -0,0 +1,160 @@
+import collections
+import itertools
+import math
+import random
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+
+from users.models import User
+
+from .models import Item, List
+
+DEFAULT_BATCH_SIZE = 5000
+
+WORDS = (
+    "buy milk eggs bread call mum book dentist pay rent water plants walk dog clean kitchen fix bike tyre post "
+    "letter return library books renew passport cancel gym email boss plan trip pack bags wash car"
+).split()
+
+SeedResult = collections.namedtuple("SeedResult", ("users", "lists", "items", "shares"))
+
+
+def _poisson(rng, mean):
+    if mean > 30:
+        # Knuth's method is slow for large means, where the normal
+        # approximation is good enough.
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    threshold = math.exp(-mean)
+    count = 0
+    product = rng.random()
+    while product > threshold:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+DISTRIBUTIONS = {
+    "constant": (1, lambda rng, n: int(n)),
+    "uniform": (2, lambda rng, low, high: rng.randint(int(low), int(high))),
+    "poisson": (1, _poisson),
+    "exponential": (1, lambda rng, mean: int(rng.expovariate(1 / mean)) if mean else 0),
+}
+
+
+def distribution(spec):
+    """
+    Parse a distribution of non-negative integers, which is one of N,
+    constant:N, uniform:LOW:HIGH, poisson:MEAN or exponential:MEAN. Return a
+    function which takes a random.Random and samples from it. Raise ValueError
+    if the spec is invalid.
+    """
+    name, *args = spec.split(":") if ":" in spec else ("constant", spec)
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution {name!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+    num_args, sample = DISTRIBUTIONS[name]
+    if len(args) != num_args:
+        raise ValueError(f"{name} takes {num_args} argument{'s' if num_args > 1 else ''}")
+    try:
+        args = [float(arg) for arg in args]
+    except ValueError:
+        raise ValueError(f"invalid number in {spec!r}")
+    if any(arg < 0 for arg in args) or (name == "uniform" and args[0] > args[1]):
+        raise ValueError(f"invalid bounds in {spec!r}")
+    return lambda rng: sample(rng, *args)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _insert(model, objs):
+    """
+    Insert some objects and return their primary keys in order. Must be called
+    in a transaction on backends which can't return them from the insert, where
+    they're read back instead.
+    """
+    manager = model._base_manager
+    if connection.features.can_return_rows_from_bulk_insert:
+        return [obj.pk for obj in manager.bulk_create(objs)]
+    last_pk = manager.aggregate(last_pk=Max("pk"))["last_pk"] or 0
+    manager.bulk_create(objs)
+    return list(manager.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True))
+
+
+def seed(
+    users,
+    lists_per_user,
+    items_per_list,
+    shares_per_list,
+    password="password",
+    batch_size=DEFAULT_BATCH_SIZE,
+    rng=None,
+    progress=None,
+):
+    """
+    Create some users, each with a number of lists of items shared with other
+    created users, where the numbers are sampled from the given distributions.
+    Rows are inserted in batches, every user shares the same password hash and
+    the lists' names and item counts are set directly rather than derived from
+    their items. progress, if given, is called with a SeedResult of the running
+    totals after each batch. Return a SeedResult of the totals.
+    """
+    rng = rng or random.Random()
+    # Not taken from rng so that seeding twice with the same seed doesn't
+    # create clashing emails.
+    prefix = uuid.uuid4().hex[:8]
+    password_hash = make_password(password)
+    ListSharee = List.shared_with.through
+    totals = SeedResult(users=0, lists=0, items=0, shares=0)
+
+    def report(**counts):
+        nonlocal totals
+        totals = totals._replace(**{field: getattr(totals, field) + count for field, count in counts.items()})
+        if progress:
+            progress(totals)
+
+    user_pks = []
+    for batch in _chunks(range(users), batch_size):
+        with transaction.atomic():
+            user_pks += _insert(
+                User, [User(email=f"seed-{prefix}-{i}@example.com", password=password_hash) for i in batch]
+            )
+        report(users=len(batch))
+
+    owner_pks = (pk for pk in user_pks for _ in range(lists_per_user(rng)))
+    for owner_batch in _chunks(owner_pks, batch_size):
+        item_texts = [
+            [f"{' '.join(rng.choices(WORDS, k=3))} {i + 1}" for i in range(items_per_list(rng))] for _ in owner_batch
+        ]
+        lists = [
+            List(owner_id=owner_pk, name=texts[0] if texts else "", item_count=len(texts))
+            for owner_pk, texts in zip(owner_batch, item_texts)
+        ]
+        with transaction.atomic():
+            list_pks = _insert(List, lists)
+
+            items = (Item(list_id=list_pk, text=text) for list_pk, texts in zip(list_pks, item_texts) for text in texts)
+            item_count = 0
+            for item_batch in _chunks(items, batch_size):
+                Item.objects.bulk_create(item_batch, refresh_summaries=False)
+                item_count += len(item_batch)
+
+            sharees = []
+            for list_pk, owner_pk in zip(list_pks, owner_batch):
+                count = min(shares_per_list(rng), len(user_pks) - 1)
+                # Sample one extra user in case the owner is picked.
+                sample = [pk for pk in rng.sample(user_pks, min(count + 1, len(user_pks))) if pk != owner_pk]
+                sharees += [ListSharee(list_id=list_pk, user_id=user_pk) for user_pk in sample[:count]]
+            for sharee_batch in _chunks(sharees, batch_size):
+                ListSharee.objects.bulk_create(sharee_batch)
+        report(lists=len(lists), items=item_count, shares=len(sharees))
+
+    return totals
@@ -1,11 +1,17 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import async_views, views
+
+page_views = async_views if settings.ASYNC_VIEWS else views
 
 app_name = "lists"
 urlpatterns = [
     path("new/", views.new_list, name="new-list"),
-    path("<int:pk>/", views.view_list, name="view-list"),
-    path("users/<str:email>/", views.my_lists, name="my-lists"),
+    path("<int:pk>/", page_views.view_list, name="view-list"),
+    path("search/", views.search, name="search"),
+    path("users/<str:email>/", page_views.my_lists, name="my-lists"),
     path("<int:pk>/share/", views.share_list, name="share-list"),
+    path("<int:pk>/import/", views.import_items, name="import-items"),
+    path("<int:pk>/export/", views.export_list, name="export-list"),
 ]
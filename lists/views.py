@@ -1,24 +1,63 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Max
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag, require_POST
 
+from superlists.db.routers import read_from_replica
 from users.models import User
 
-from .forms import ItemForm, NewListForm, ShareListForm
+from . import exports, pagination
+from .forms import ImportItemsForm, ItemForm, NewListForm, ShareListForm
 from .models import List
+from .search import search_items
 
 
+def _items_page(request, list_):
+    return pagination.KeysetPage(list_.items.all(), settings.LIST_PAGE_SIZE, request.GET)
+
+
+def _list(request, pk):
+    """
+    Get a list and its owner, once per request, so that the list that the
+    conditional GET functions fetch is reused by the view.
+    """
+    if not hasattr(request, "_list"):
+        request._list = List.objects.select_related("owner").get(pk=pk)
+    return request._list
+
+
+def _list_etag(request, pk):
+    # The page depends on who's viewing it and which page of items it shows.
+    return f"{pk}-{_list(request, pk).version}-{request.user.pk}-{request.GET.urlencode()}"
+
+
+# The pages don't have a Last-Modified header, as a modification time can't
+# tell apart the pages of different users, so browsers must revalidate them
+# with their ETags.
+@cache_control(private=True, no_cache=True)
+@read_from_replica
+@etag(_list_etag)
 def view_list(request, pk):
-    list_ = List.objects.get(pk=pk)
+    list_ = _list(request, pk)
 
     if request.method == "POST":
         form = ItemForm(request.POST, list_=list_)
         if form.is_valid():
-            form.save()
-            return redirect(list_)
+            item = form.save()
+            if item:
+                if list_.item_count <= settings.LIST_PAGE_SIZE:
+                    return redirect(list_)
+                # Show the new item on the last page rather than the first one.
+                query = pagination.last_page_query(item.pk, list_.item_count, settings.LIST_PAGE_SIZE)
+                return redirect(f"{list_.get_absolute_url()}?{query}")
     else:
         form = ItemForm()
 
-    return render(request, "lists/list.html", {"list": list_, "form": form, "share_form": ShareListForm()})
+    context = {"list": list_, "page": _items_page(request, list_), "form": form, "share_form": ShareListForm()}
+    return render(request, "lists/list.html", context)
 
 
 def home_page(request):
@@ -33,9 +72,38 @@ def new_list(request):
     return render(request, "lists/home.html", {"form": form})
 
 
+@login_required(redirect_field_name=None)
+def search(request):
+    query = request.GET.get("q", "").strip()
+    page = search_items(request.user, query, settings.SEARCH_PAGE_SIZE, request.GET)
+    return render(request, "lists/search.html", {"query": query, "page": page})
+
+
+def _visible_lists(request, email):
+    """
+    Get a user and the number and latest modification time of the lists
+    visible to them, once per request, for my_lists and its ETag function.
+    """
+    if not hasattr(request, "_visible_lists"):
+        owner = User.objects.get_by_natural_key(email)
+        summary = List.objects.visible_to(owner).aggregate(count=Count("pk"), modified=Max("modified"))
+        request._visible_lists = (owner, summary["count"], summary["modified"])
+    return request._visible_lists
+
+
+def _my_lists_etag(request, email):
+    owner, count, modified = _visible_lists(request, email)
+    timestamp = modified.timestamp() if modified else None
+    return f"{owner.pk}-{count}-{timestamp}-{request.user.pk}-{request.GET.urlencode()}"
+
+
+@cache_control(private=True, no_cache=True)
+@read_from_replica
+@etag(_my_lists_etag)
 def my_lists(request, email):
-    owner = User.objects.get(email=email)
-    return render(request, "lists/my_lists.html", {"owner": owner})
+    owner, _, _ = _visible_lists(request, email)
+    page = pagination.KeysetPage(List.objects.visible_to(owner), settings.LIST_PAGE_SIZE, request.GET)
+    return render(request, "lists/my_lists.html", {"owner": owner, "page": page})
 
 
 @login_required(redirect_field_name=None)
@@ -45,4 +113,40 @@ def share_list(request, pk):
         list_ = form.save()
         return redirect(list_)
     else:
-        return render(request, "lists/list.html", {"form": ItemForm(), "share_form": form, "list": form.list})
+        list_ = form.list
+        context = {"form": ItemForm(), "share_form": form, "list": list_, "page": _items_page(request, list_)}
+        return render(request, "lists/list.html", context)
+
+
+@require_POST
+def import_items(request, pk):
+    list_ = List.objects.get(pk=pk)
+    form = ImportItemsForm(data=request.POST, files=request.FILES)
+    if form.is_valid():
+        result = form.save(list_)
+        return JsonResponse(result._asdict())
+    else:
+        return JsonResponse({"errors": form.errors}, status=400)
+
+
+def _export_etag(request, pk):
+    version = List.objects.filter(pk=pk).values_list("version", flat=True).first()
+    if version is not None:
+        return f"{pk}-{version}-{request.GET.get('format', exports.CSV)}"
+
+
+@etag(_export_etag)
+def export_list(request, pk):
+    format = request.GET.get("format", exports.CSV)
+    if format not in exports.EXPORTERS:
+        return HttpResponseBadRequest(f"Unknown format: {format}")
+
+    list_ = List.objects.select_related("owner").get(pk=pk)
+    response = StreamingHttpResponse(exports.export(list_, format), content_type=exports.CONTENT_TYPES[format])
+    response["Content-Disposition"] = f'attachment; filename="list-{list_.pk}.{format}"'
+    if format == exports.CSV:
+        # CSV has nowhere to put the list's metadata, so send it in headers.
+        metadata = exports.metadata(list_)
+        response["X-List-Owner"] = metadata["owner"] or ""
+        response["X-List-Shared-With"] = ", ".join(metadata["shared_with"])
+    return response
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+
+from .handlers import ASGIHandler
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "superlists.settings")
+os.environ.setdefault("ASYNC_VIEWS", "true")
 
-application = get_asgi_application()
+# What get_asgi_application() does, with a handler which can stream responses
+# that query the database.
+django.setup(set_prefix=False)
+application = ASGIHandler()
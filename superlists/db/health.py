@@ -0,0 +1,57 @@
+import collections
+import threading
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+STAT_NAMES = ("opened", "reused", "failed_health_checks")
+
+# Counts of what has happened to each database's connections in this process,
+# which is a single gunicorn worker.
+_stats = collections.defaultdict(collections.Counter)
+_stats_lock = threading.Lock()
+
+
+def _count(alias, stat):
+    with _stats_lock:
+        _stats[alias][stat] += 1
+
+
+def stats():
+    """
+    Return the number of connections to each database which this process has
+    opened, the number of times that an open connection has been reused by a
+    request and the number of open connections which failed a health check.
+    """
+    with _stats_lock:
+        return {alias: {name: counts[name] for name in STAT_NAMES} for alias, counts in _stats.items()}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def count_opened_connection(connection, **kwargs):
+    _count(connection.alias, "opened")
+
+
+connection_created.connect(count_opened_connection)
+
+
+def check_connections():
+    """
+    Check that this thread's open connections, which have persisted from an
+    earlier request, still work and close the ones which don't, so that the
+    request reconnects rather than failing on a connection that the database
+    server has dropped. Call after close_old_connections() has closed the
+    connections which have expired.
+    """
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        if connection.is_usable():
+            _count(connection.alias, "reused")
+        else:
+            _count(connection.alias, "failed_health_checks")
+            connection.close()
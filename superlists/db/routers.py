@@ -0,0 +1,56 @@
+import contextvars
+import functools
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Set on responses to unsafe requests so that the client's reads go to the
+# primary until the replicas have caught up with its writes.
+PIN_COOKIE = "pin_primary"
+
+# The replica which the request being handled reads from, if any.
+_replica = contextvars.ContextVar("replica", default=None)
+
+
+def read_from_replica(view):
+    """
+    Make a view read from a random replica database when it's handling a safe
+    request from a client which isn't pinned to the primary. Every read made
+    while handling the request goes to the same replica so that they're
+    consistent with each other.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        replica = None
+        if settings.DATABASE_REPLICAS and request.method in ("GET", "HEAD") and PIN_COOKIE not in request.COOKIES:
+            replica = random.choice(settings.DATABASE_REPLICAS)
+        token = _replica.set(replica)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica.reset(token)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Send reads made by views decorated with read_from_replica to the replica
+    that they chose and everything else to the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        # Not None, which would write instances read from a replica back to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every database has the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,29 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend which runs the PRAGMAs in the "pragmas" option on every new
+    connection and starts transactions with the mode in the "transaction_mode"
+    option (DEFERRED, IMMEDIATE or EXCLUSIVE).
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pragmas", None)
+        params.pop("transaction_mode", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict["OPTIONS"].get("pragmas", {}).items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        # A deferred transaction which reads and then writes has to upgrade its
+        # lock, which fails immediately with "database is locked" rather than
+        # waiting for busy_timeout if another connection is writing. Taking the
+        # write lock at the start means that it waits instead.
+        mode = self.settings_dict["OPTIONS"].get("transaction_mode", "DEFERRED")
+        self.cursor().execute(f"BEGIN {mode}")
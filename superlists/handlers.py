@@ -0,0 +1,45 @@
+import itertools
+
+from asgiref.sync import sync_to_async
+from django.core.handlers import asgi
+
+# Number of parts of a streaming response to generate per trip to the thread
+# which generates them.
+STREAMING_BATCH_SIZE = 1000
+
+
+class ASGIHandler(asgi.ASGIHandler):
+    """
+    Django's ASGI handler, except that the content of streaming responses is
+    generated in the thread that sync views run in. Django 3.1 iterates over
+    it on the event loop, where streaming content that queries the database
+    raises SynchronousOnlyOperation.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            await super().send_response(response, send)
+            return
+
+        headers = [
+            (
+                header.encode("ascii") if isinstance(header, str) else header,
+                value.encode("latin1") if isinstance(value, str) else value,
+            )
+            for header, value in response.items()
+        ]
+        headers.extend((b"Set-Cookie", c.output(header="").encode("ascii").strip()) for c in response.cookies.values())
+        await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+
+        parts = iter(response)
+        # The same thread as the view, so that server side cursors opened by
+        # the view's connection can be read from.
+        next_batch = sync_to_async(lambda: list(itertools.islice(parts, STREAMING_BATCH_SIZE)), thread_sensitive=True)
+        while True:
+            batch = await next_batch()
+            if not batch:
+                break
+            for chunk, _ in self.chunk_bytes(b"".join(batch)):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body"})
+        await sync_to_async(response.close, thread_sensitive=True)()
@@ -0,0 +1,153 @@
+import asyncio
+import contextvars
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+
+from .db import health
+from .db.routers import PIN_COOKIE
+
+# The stats of the request being handled. A context variable rather than an
+# attribute of the connection so that queries made by async views, which run
+# in other threads with their own connections, are counted against the right
+# request.
+_current_stats = contextvars.ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """The number of queries made while handling a request and their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper which records queries against the stats of the
+    request being handled, if there is one.
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.duration += time.perf_counter() - start
+        stats.count += 1
+
+
+def install_query_recorder(connection, **kwargs):
+    # Inserted at the front so that it doesn't get popped by the exit of an
+    # execute_wrapper() block which was entered before it was installed.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@sync_and_async_middleware
+def connection_health_middleware(get_response):
+    """
+    Health check the database connections which have persisted from earlier
+    requests before handling a request. Async views run in other threads, so
+    they check their own connections.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        return get_response
+
+    def middleware(request):
+        health.check_connections()
+        return get_response(request)
+
+    return middleware
+
+
+@sync_and_async_middleware
+def query_count_middleware(get_response):
+    """
+    Report the number of database queries made while handling a request and
+    the time spent running them in the X-DB-Queries and X-DB-Time (in
+    milliseconds) headers and in a Server-Timing entry of the response.
+    Queries made while a streaming response is consumed aren't included.
+
+    Only used if DB_QUERY_HEADERS is set, as the headers expose the backend's
+    timings and the queries are only timed if it's used.
+    """
+    if not settings.DB_QUERY_HEADERS:
+        raise MiddlewareNotUsed()
+    connection_created.connect(install_query_recorder)
+
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            stats = QueryStats()
+            token = _current_stats.set(stats)
+            try:
+                response = await get_response(request)
+            finally:
+                _current_stats.reset(token)
+            return _add_query_headers(response, stats)
+
+    else:
+
+        def middleware(request):
+            # Connections made before the middleware was loaded won't have
+            # had the recorder installed by the connection_created signal.
+            for connection in connections.all():
+                install_query_recorder(connection)
+
+            stats = QueryStats()
+            token = _current_stats.set(stats)
+            try:
+                response = get_response(request)
+            finally:
+                _current_stats.reset(token)
+            return _add_query_headers(response, stats)
+
+    return middleware
+
+
+def _add_query_headers(response, stats):
+    duration_ms = stats.duration * 1000
+    response["X-DB-Queries"] = str(stats.count)
+    response["X-DB-Time"] = f"{duration_ms:.3f}"
+    response["Server-Timing"] = f'db;dur={duration_ms:.3f};desc="{stats.count} queries"'
+    return response
+
+
+@sync_and_async_middleware
+def replica_pin_middleware(get_response):
+    """
+    Pin clients to the primary database for DATABASE_REPLICA_PIN_SECONDS
+    after they make an unsafe request, so that they don't read stale data from
+    a replica after a POST redirects them to a page showing what they wrote.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            return _pin(request, await get_response(request))
+
+    else:
+
+        def middleware(request):
+            return _pin(request, get_response(request))
+
+    return middleware
+
+
+def _pin(request, response):
+    if settings.DATABASE_REPLICAS and request.method not in ("GET", "HEAD", "OPTIONS", "TRACE"):
+        response.set_cookie(
+            PIN_COOKIE,
+            "1",
+            max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+            secure=request.is_secure(),
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
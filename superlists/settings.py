@@ -1,3 +1,5 @@
+import glob
+
 import environ
 
 env = environ.Env()
@@ -28,6 +30,9 @@ if DEBUG:
     INSTALLED_APPS += ["django_extensions"]
 
 MIDDLEWARE = [
+    "superlists.middleware.connection_health_middleware",
+    "superlists.middleware.query_count_middleware",
+    "superlists.middleware.replica_pin_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -37,6 +42,11 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Report the number of database queries made by each request and the time
+# spent on them in response headers. Off by default, as they expose how long
+# the backend takes.
+DB_QUERY_HEADERS = env.bool("DB_QUERY_HEADERS", default=False)
+
 ROOT_URLCONF = "superlists.urls"
 
 TEMPLATES = [
@@ -57,9 +67,52 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "superlists.wsgi.application"
 
+# Serve the async versions of the views which have them. Enabled by default
+# when running under ASGI.
+ASYNC_VIEWS = env.bool("ASYNC_VIEWS", default=False)
+
 default_db_root = root if DEBUG else data
 DATABASES = {"default": env.db_url("DATABASE_URL", default=f"sqlite:///{default_db_root('db.sqlite3')}")}
 
+# Read replicas of the default database. Only views decorated with
+# superlists.db.routers.read_from_replica read from them, and not for a while
+# after the client makes a POST request so that it sees its own writes.
+DATABASE_REPLICAS = []
+for i, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), start=1):
+    DATABASE_REPLICAS.append(f"replica{i}")
+    DATABASES[f"replica{i}"] = {**env.db_url_config(url), "TEST": {"MIRROR": "default"}}
+DATABASE_ROUTERS = ["superlists.db.routers.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=10)
+
+# Keep connections open between requests for this many seconds, rather than
+# connecting for every request. They're health checked by
+# superlists.middleware.connection_health_middleware before being reused.
+CONN_MAX_AGE = env.int("CONN_MAX_AGE", default=60)
+
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = CONN_MAX_AGE
+    if database["ENGINE"] != "django.db.backends.sqlite3":
+        continue
+    # Tune SQLite for concurrent access by the gunicorn workers. WAL journaling
+    # lets reads run alongside a write, and writers wait for each other for up
+    # to busy_timeout milliseconds rather than failing with "database is
+    # locked". A negative cache_size is in KiB.
+    database["ENGINE"] = "superlists.db.sqlite3"
+    database.setdefault("OPTIONS", {}).update(
+        pragmas={
+            "journal_mode": env.str("SQLITE_JOURNAL_MODE", default="wal"),
+            "busy_timeout": env.int("SQLITE_BUSY_TIMEOUT", default=5000),
+            "synchronous": env.str("SQLITE_SYNCHRONOUS", default="normal"),
+            "mmap_size": env.int("SQLITE_MMAP_SIZE", default=128 * 1024 * 1024),
+            "cache_size": env.int("SQLITE_CACHE_SIZE", default=-16 * 1024),
+        },
+        transaction_mode=env.str("SQLITE_TRANSACTION_MODE", default="immediate"),
+    )
+
+# Use a shared cache such as memcached in production so that cached template
+# fragments are shared between gunicorn workers.
+CACHES = {"default": env.cache_url("CACHE_URL", default="locmemcache://")}
+
 MIN_PASSWORD_LENGTH = 10
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -88,16 +141,58 @@ STATICFILES_DIRS = [
 
 STATIC_ROOT = env("STATIC_ROOT", default=data("static"))
 
+# Hash the names of the collected static files so that they can be cached
+# forever, and save compressed copies of them for nginx to serve.
+STATICFILES_STORAGE = env("STATICFILES_STORAGE", default="superlists.storage.CompressedManifestStaticFilesStorage")
+
+# CSS files which are purged of the classes which aren't used by any of the
+# files in STATIC_PURGE_CONTENT when they're collected.
+STATIC_PURGE_CSS = ["lists/bulma.min.css"]
+
+STATIC_PURGE_CONTENT = [
+    *glob.glob(root("*", "templates", "**", "*.html"), recursive=True),
+    *glob.glob(root("*", "forms.py")),
+    *glob.glob(root("js", "*.js")),
+]
+
 CSRF_COOKIE_SECURE = env.bool("CSRF_COOKIE_SECURE", default=True)
 
 SESSION_COOKIE_SECURE = env.bool("SESSION_COOKIE_SECURE", default=True)
 
+# "db" reads the session from the database on every request which uses it.
+# "cached_db" and "cache" read it from the cache instead, so CACHE_URL must be
+# a cache which is shared between the workers, and "cache" loses sessions when
+# they're evicted. "signed_cookies" stores the session in the cookie itself.
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_ENGINE = SESSION_ENGINES[env.str("SESSION_ENGINE", default="db")]
+
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
 AUTH_USER_MODEL = "users.User"
 
+AUTHENTICATION_BACKENDS = ["users.backends.CachedModelBackend"]
+
+# Cache the user of each session for this many seconds, or not at all if 0.
+# Off by default with the local memory cache, because a user saved by one
+# worker would stay cached in the other workers' caches.
+USER_CACHE_TIMEOUT = env.int(
+    "USER_CACHE_TIMEOUT", default=0 if CACHES["default"]["BACKEND"].endswith("LocMemCache") else 300
+)
+
 LOGIN_REDIRECT_URL = "home"
 
 LOGOUT_REDIRECT_URL = "home"
 
 LOGIN_URL = "users:login"
+
+LIST_PAGE_SIZE = env.int("LIST_PAGE_SIZE", default=100)
+SEARCH_PAGE_SIZE = env.int("SEARCH_PAGE_SIZE", default=20)
+EMAIL_AUTOCOMPLETE_MIN_LENGTH = env.int("EMAIL_AUTOCOMPLETE_MIN_LENGTH", default=3)
+EMAIL_AUTOCOMPLETE_LIMIT = env.int("EMAIL_AUTOCOMPLETE_LIMIT", default=10)
+# Most items that can be added to a list by one request to the API.
+API_BATCH_LIMIT = env.int("API_BATCH_LIMIT", default=1000)
@@ -0,0 +1,179 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+COMPRESSED_EXTENSIONS = (".css", ".js", ".svg", ".txt", ".json", ".map")
+
+# Files smaller than this aren't worth compressing.
+MIN_COMPRESS_SIZE = 256
+
+_CLASS_RE = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+_TOKEN_RE = re.compile(r"[\w-]+")
+
+
+def used_tokens(paths):
+    """
+    Return every word in some files, which includes every class name that they
+    use.
+    """
+    tokens = set()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            tokens.update(_TOKEN_RE.findall(f.read()))
+    return tokens
+
+
+def _top_level(text):
+    """
+    Yield the index of each character of a CSS selector which isn't inside
+    brackets or strings.
+    """
+    depth = 0
+    quote = None
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote and text[i - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif depth == 0:
+            yield i
+
+
+def _split_selectors(text):
+    """Split a comma separated list of CSS selectors."""
+    parts = []
+    start = 0
+    for i in _top_level(text):
+        if text[i] == ",":
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _selector_classes(selector):
+    """
+    Return the classes which an element must have to match a CSS selector,
+    ignoring the ones in pseudo-classes like :not().
+    """
+    return set(_CLASS_RE.findall("".join(selector[i] for i in _top_level(selector))))
+
+
+def _blocks(css):
+    """
+    Yield the top level statements of some CSS as (prelude, body) pairs, where
+    body is None for statements without a block like @charset.
+    """
+    depth = 0
+    quote = None
+    start = 0
+    prelude = body_start = None
+    for i, char in enumerate(css):
+        if quote:
+            if char == quote and css[i - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "{":
+            if depth == 0:
+                prelude = css[start:i]
+                body_start = i + 1
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                yield prelude.strip(), css[body_start:i]
+                start = i + 1
+        elif char == ";" and depth == 0:
+            yield css[start:i].strip(), None
+            start = i + 1
+
+
+def purge_css(css, used):
+    """
+    Remove the selectors from some CSS which use a class that isn't in a set of
+    used names, and the rules which are left without any selectors.
+    """
+    output = []
+    for prelude, body in _blocks(css):
+        if body is None:
+            output.append(f"{prelude};")
+        elif prelude.startswith(("@media", "@supports")):
+            body = purge_css(body, used)
+            if body:
+                output.append(f"{prelude}{{{body}}}")
+        elif prelude.startswith("@"):
+            output.append(f"{prelude}{{{body}}}")
+        else:
+            selectors = [selector for selector in _split_selectors(prelude) if _selector_classes(selector) <= used]
+            if selectors:
+                output.append(f"{','.join(selectors)}{{{body}}}")
+    return "".join(output)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage which purges the unused classes from the CSS
+    files in STATIC_PURGE_CSS before hashing them, and saves gzip and (if the
+    brotli package is installed) brotli compressed copies of the hashed files
+    alongside them for the web server to serve.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+
+        paths = self._purge(paths)
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not isinstance(processed, Exception) and hashed_name:
+                self._compress(hashed_name)
+            yield name, hashed_name, processed
+
+    def _purge(self, paths):
+        """
+        Purge the collected copies of the CSS files in STATIC_PURGE_CSS and
+        return the paths to post process with them in place of the originals,
+        so that they're what gets hashed.
+        """
+        purge_names = [name for name in paths if name in settings.STATIC_PURGE_CSS]
+        if not purge_names:
+            return paths
+
+        used = used_tokens(settings.STATIC_PURGE_CONTENT)
+        paths = dict(paths)
+        for name in purge_names:
+            with self.open(name) as f:
+                css = f.read().decode("utf-8")
+            self.delete(name)
+            self._save(name, ContentFile(purge_css(css, used).encode("utf-8")))
+            paths[name] = (self, name)
+        return paths
+
+    def _compress(self, name):
+        if not name.endswith(COMPRESSED_EXTENSIONS):
+            return
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+
+        compressed = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed[".br"] = brotli.compress(content)
+        for extension, data in compressed.items():
+            if self.exists(name + extension):
+                self.delete(name + extension)
+            self._save(name + extension, ContentFile(data))
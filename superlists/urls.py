@@ -1,9 +1,13 @@
 from django.urls import include, path
 
-from lists import views as list_views
+from lists.urls import page_views as list_page_views
+
+from . import views
 
 urlpatterns = [
-    path("", list_views.home_page, name="home"),
+    path("", list_page_views.home_page, name="home"),
     path("lists/", include("lists.urls")),
+    path("api/v1/", include("lists.api_urls")),
     path("", include("users.urls")),
+    path("db-stats/", views.db_stats, name="db-stats"),
 ]
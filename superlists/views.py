@@ -0,0 +1,15 @@
+import os
+
+from django.contrib.auth.decorators import user_passes_test
+from django.http import JsonResponse
+
+from .db import health
+
+
+@user_passes_test(lambda user: user.is_staff, redirect_field_name=None)
+def db_stats(request):
+    """
+    Return the stats of the database connections of the worker process which
+    handles the request.
+    """
+    return JsonResponse({"pid": os.getpid(), "connections": health.stats()})
@@ -0,0 +1,46 @@
+import gc
+import glob
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db import connections
+from django.template import engines
+from django.urls import get_resolver
+from django.utils import translation
+
+
+def _template_names(engine):
+    for directory in engine.template_dirs:
+        for path in glob.glob(os.path.join(directory, "**", "*.html"), recursive=True):
+            yield os.path.relpath(path, directory)
+
+
+def warm_up():
+    """
+    Load the parts of the app which are otherwise loaded by the first request
+    that needs them: the URL resolver, the compiled templates, the translation
+    catalog and the static files manifest.
+    """
+    get_resolver().reverse_dict
+    for engine in engines.all():
+        for name in _template_names(engine):
+            engine.get_template(name)
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.deactivate()
+    staticfiles_storage.base_url
+
+
+def freeze():
+    """
+    Warm up the app and move everything that it has loaded into the garbage
+    collector's permanent generation. Call in the gunicorn master before it
+    forks the workers, so that the workers share the memory holding the app
+    rather than each getting their own copy of the pages which collections
+    write to.
+    """
+    warm_up()
+    # A connection opened by the master would be shared by every worker.
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
@@ -1,5 +1,6 @@
 import pytest
 import pytest_factoryboy
+from django.core.cache import caches
 
 from .fixtures.factories import ItemFactory, ListFactory, UserFactory
 from .fixtures.signup import *  # noqa: F403, F401
@@ -10,6 +11,25 @@ pytest_factoryboy.register(ItemFactory)
 pytest_factoryboy.register(UserFactory)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Clear the caches before each test, as primary keys (and so cache keys) are
+    reused between tests.
+    """
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def static_files_storage(settings):
+    """
+    Don't use the manifest storage, which needs collectstatic to have been run
+    to find the hashed names of the static files.
+    """
+    settings.STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
+
+
 def pytest_addoption(parser):
     parser.addoption("--functional", action="store_true", help="run functional tests as well")
     parser.addoption("--functional-only", action="store_true", help="run only the functional tests")
@@ -16,7 +16,7 @@ def test_can_share_a_list_with_another_user(  # noqa: E302
     list_url = browser.current_url
 
     # She notices a "Share this list" option
-    assert list_page.share_box.get_attribute("placeholder") == "your-friend@example.com"
+    assert list_page.share_box.get_attribute("placeholder") == "your-friend@example.com, another-friend@example.com"
 
     # She shares her list.
     # The page updates to say that it's shared with Oniciferous
@@ -50,7 +50,7 @@ def test_cant_share_a_list_with_a_user_without_an_account(browser, user, base_ur
 
     # An error shows up below the share box saying that John doesn't have an
     # account
-    wait_for(lambda: list_page.share_box_error == "This user doesn't have an account.")
+    wait_for(lambda: list_page.share_box_error == "john.smith@gmail.com doesn't have an account.")
     assert "john.smith@gmail.com" not in list_page.shared_with_list
 
 
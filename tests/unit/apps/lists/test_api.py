@@ -0,0 +1,342 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test import Client
+
+from lists.models import Item, List
+
+pytestmark = pytest.mark.django_db
+
+
+def post_json(client, url, data, **extra):
+    return client.post(url, json.dumps(data), content_type="application/json", **extra)
+
+
+@pytest.fixture
+def logged_in_client(client, user):
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def csrf_client():
+    """A client which makes requests that need CSRF tokens, like a browser."""
+    return Client(enforce_csrf_checks=True)
+
+
+class TestCreateList:
+    url = "/api/v1/lists/"
+
+    def test_creates_list_with_first_item(self, client):
+        response = post_json(client, self.url, {"text": "first item"})
+
+        assert response.status_code == 201
+        list_ = List.objects.get()
+        assert response.json() == {
+            "id": list_.pk,
+            "url": f"/api/v1/lists/{list_.pk}/",
+            "name": "first item",
+            "owner": None,
+            "item_count": 1,
+            "version": 1,
+        }
+
+    def test_list_is_owned_by_logged_in_user(self, logged_in_client, user):
+        response = post_json(logged_in_client, self.url, {"text": "first item"})
+
+        assert response.json()["owner"] == user.email
+        assert List.objects.get().owner == user
+
+    def test_returns_form_errors_if_text_empty(self, client):
+        response = post_json(client, self.url, {"text": ""})
+
+        assert response.status_code == 400
+        assert response.json()["errors"] == {
+            "text": [{"message": "You can't save an empty list item", "code": "required"}]
+        }
+        assert not List.objects.exists()
+
+    def test_returns_error_if_body_isnt_json(self, client):
+        response = client.post(self.url, "text=first", content_type="application/json")
+
+        assert response.status_code == 400
+        assert response.json()["errors"]["__all__"][0]["code"] == "invalid_json"
+
+    def test_returns_error_if_body_isnt_json_object(self, client):
+        response = post_json(client, self.url, ["first item"])
+
+        assert response.status_code == 400
+        assert response.json()["errors"]["__all__"][0]["code"] == "invalid_json"
+
+    def test_only_allows_POST(self, client):
+        assert client.get(self.url).status_code == 405
+
+    def test_doesnt_need_csrf_token_if_not_logged_in(self, csrf_client):
+        assert post_json(csrf_client, self.url, {"text": "first item"}).status_code == 201
+
+    def test_needs_csrf_token_if_logged_in(self, csrf_client, user):
+        csrf_client.force_login(user)
+
+        response = post_json(csrf_client, self.url, {"text": "first item"})
+
+        assert response.status_code == 403
+        assert response.json()["errors"]["__all__"][0]["code"] == "csrf_failed"
+        assert not List.objects.exists()
+
+    def test_accepts_csrf_token_if_logged_in(self, csrf_client, user):
+        csrf_client.force_login(user)
+        csrf_client.get("/login/")
+        token = csrf_client.cookies["csrftoken"].value
+
+        response = post_json(csrf_client, self.url, {"text": "first item"}, HTTP_X_CSRFTOKEN=token)
+
+        assert response.status_code == 201
+
+
+class TestViewList:
+    @pytest.fixture
+    def url(self, list):
+        return f"/api/v1/lists/{list.pk}/"
+
+    def test_returns_list_sharees_and_items(self, client, url, list, item_factory, user_factory):
+        items = item_factory.create_batch(2, list=list)
+        list.shared_with.add(user_factory(email="b@example.com"), user_factory(email="a@example.com"))
+        list.refresh_from_db()
+
+        data = client.get(url).json()
+
+        assert data["id"] == list.pk
+        assert data["name"] == items[0].text
+        assert data["item_count"] == 2
+        assert data["shared_with"] == ["a@example.com", "b@example.com"]
+        assert data["items"] == [{"id": item.pk, "text": item.text} for item in items]
+        assert data["next"] is None
+        assert data["previous"] is None
+
+    def test_returns_page_of_items(self, client, url, list, item_factory, settings):
+        settings.LIST_PAGE_SIZE = 2
+        items = item_factory.create_batch(5, list=list)
+
+        first_page = client.get(url).json()
+        second_page = client.get(first_page["next"]).json()
+
+        assert [item["id"] for item in first_page["items"]] == [items[0].pk, items[1].pk]
+        assert [item["id"] for item in second_page["items"]] == [items[2].pk, items[3].pk]
+        assert second_page["previous"].startswith(url)
+
+    def test_returns_empty_page_if_before_first_item(self, client, url, list, item_factory):
+        items = item_factory.create_batch(2, list=list)
+
+        data = client.get(url, {"before": items[0].pk}).json()
+
+        assert data["items"] == []
+        assert data["next"] is None
+        assert data["previous"] is None
+
+    def test_returns_404_if_list_doesnt_exist(self, client):
+        response = client.get("/api/v1/lists/1/")
+
+        assert response.status_code == 404
+        assert response.json()["errors"]["__all__"][0]["code"] == "not_found"
+
+    @pytest.mark.query_budget(3)
+    def test_GET_is_within_query_budget(self, client, url, list, item_factory, user_factory, query_budget):
+        item_factory.create_batch(10, list=list)
+        list.shared_with.add(*user_factory.create_batch(3))
+
+        with query_budget():
+            client.get(url)
+
+
+class TestAddItem:
+    @pytest.fixture
+    def url(self, list):
+        return f"/api/v1/lists/{list.pk}/items/"
+
+    def test_adds_item_to_list(self, client, url, list):
+        response = post_json(client, url, {"text": "new item"})
+
+        assert response.status_code == 201
+        item = Item.objects.get()
+        assert item.list == list
+        assert response.json() == {"id": item.pk, "text": "new item"}
+
+    def test_returns_error_if_item_duplicate(self, client, url, list, item_factory):
+        item_factory(list=list, text="item")
+
+        response = post_json(client, url, {"text": "item"})
+
+        assert response.status_code == 400
+        assert response.json()["errors"] == {"text": [{"message": "You can't save a duplicate item", "code": "unique"}]}
+
+    def test_returns_404_if_list_doesnt_exist(self, client):
+        assert post_json(client, "/api/v1/lists/1/items/", {"text": "item"}).status_code == 404
+
+
+class TestAddItems:
+    @pytest.fixture
+    def url(self, list):
+        return f"/api/v1/lists/{list.pk}/items/batch/"
+
+    def test_adds_items_to_list(self, client, url, list):
+        response = post_json(client, url, {"items": ["first", "second", "third"]})
+
+        assert response.status_code == 201
+        assert response.json() == {"added": 3, "url": f"/api/v1/lists/{list.pk}/"}
+        assert list.items.count() == 3
+        list.refresh_from_db()
+        assert list.name == "first"
+        assert list.item_count == 3
+
+    def test_adds_nothing_if_any_item_invalid(self, client, url, list, item_factory):
+        item_factory(list=list, text="existing")
+
+        response = post_json(client, url, {"items": ["new", "", "existing", "new"]})
+
+        assert response.status_code == 400
+        assert response.json()["errors"] == {
+            "items": {"1": {"text": [{"message": "You can't save an empty list item", "code": "required"}]}}
+        }
+        assert list.items.count() == 1
+
+    def test_returns_errors_for_duplicates(self, client, url, list, item_factory):
+        item_factory(list=list, text="existing")
+
+        response = post_json(client, url, {"items": ["new", "existing", "new"]})
+
+        errors = response.json()["errors"]["items"]
+        assert set(errors) == {"1", "2"}
+        assert errors["1"]["text"][0]["code"] == "unique"
+        assert list.items.count() == 1
+
+    @pytest.mark.parametrize("items", [None, [], "item"])
+    def test_returns_error_if_items_not_non_empty_array(self, client, url, items):
+        response = post_json(client, url, {"items": items})
+
+        assert response.status_code == 400
+        assert response.json()["errors"]["items"][0]["code"] == "invalid"
+
+    def test_returns_error_if_too_many_items(self, client, url, list, settings):
+        settings.API_BATCH_LIMIT = 2
+
+        response = post_json(client, url, {"items": ["first", "second", "third"]})
+
+        assert response.status_code == 413
+        assert not list.items.exists()
+
+    @pytest.fixture
+    def max_query_params(self):
+        """Fail any query with more parameters than the database allows."""
+
+        def check_params(execute, sql, params, many, context):
+            assert params is None or len(params) <= connection.features.max_query_params, sql
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(check_params):
+            yield
+
+    def test_checks_as_many_items_as_the_limit(self, client, url, list, item_factory, settings, max_query_params):
+        item_factory(list=list, text=f"item {settings.API_BATCH_LIMIT - 1}")
+        texts = [f"item {i}" for i in range(settings.API_BATCH_LIMIT)]
+
+        response = post_json(client, url, {"items": texts})
+
+        assert response.status_code == 400
+        assert set(response.json()["errors"]["items"]) == {str(settings.API_BATCH_LIMIT - 1)}
+
+    def test_finds_duplicates_in_every_chunk(self, client, url, list, item_factory, mocker, max_query_params):
+        mocker.patch.object(connection.features, "max_query_params", 6)
+        item_factory(list=list, text="item 7")
+
+        response = post_json(client, url, {"items": [f"item {i}" for i in range(12)]})
+
+        assert set(response.json()["errors"]["items"]) == {"7"}
+
+    def test_returns_conflict_if_item_added_concurrently(self, client, url, list, item_factory, mocker):
+        # The duplicate isn't found by the check before the insert.
+        mocker.patch("lists.api.Item.objects.filter").return_value.values_list.return_value = []
+        item_factory(list=list, text="existing")
+
+        response = post_json(client, url, {"items": ["new", "existing"]})
+
+        assert response.status_code == 409
+        assert list.items.count() == 1
+
+    # The query for duplicates, the insert, the summaries update and the
+    # savepoint around them and its release.
+    @pytest.mark.query_budget(6)
+    def test_POST_is_within_query_budget(self, client, url, query_budget):
+        with query_budget():
+            post_json(client, url, {"items": [f"item {i}" for i in range(100)]})
+
+
+class TestShareList:
+    @pytest.fixture
+    def url(self, list):
+        return f"/api/v1/lists/{list.pk}/share/"
+
+    def test_shares_list_with_sharees(self, logged_in_client, url, list, user_factory):
+        sharees = [user_factory(email="a@example.com"), user_factory(email="b@example.com")]
+
+        response = post_json(logged_in_client, url, {"sharees": ["a@example.com", "B@example.com"]})
+
+        assert response.status_code == 200
+        assert response.json() == {"shared_with": ["a@example.com", "b@example.com"]}
+        assert set(list.shared_with.all()) == set(sharees)
+
+    def test_accepts_separated_emails(self, logged_in_client, url, list, user_factory):
+        user_factory(email="a@example.com")
+        user_factory(email="b@example.com")
+
+        response = post_json(logged_in_client, url, {"sharee": "a@example.com, b@example.com"})
+
+        assert response.json() == {"shared_with": ["a@example.com", "b@example.com"]}
+
+    def test_returns_form_errors(self, logged_in_client, url, list):
+        response = post_json(logged_in_client, url, {"sharees": ["nobody@example.com"]})
+
+        assert response.status_code == 400
+        assert response.json()["errors"]["sharee"][0]["code"] == "no_account"
+        assert not list.shared_with.exists()
+
+    def test_needs_user_to_be_logged_in(self, client, url, list, user):
+        response = post_json(client, url, {"sharees": [user.email]})
+
+        assert response.status_code == 403
+        assert not list.shared_with.exists()
+
+    def test_returns_404_if_list_doesnt_exist(self, logged_in_client, user_factory):
+        sharee = user_factory()
+
+        response = post_json(logged_in_client, "/api/v1/lists/1/share/", {"sharees": [sharee.email]})
+
+        assert response.status_code == 404
+
+
+class TestMyLists:
+    def test_returns_page_of_owned_and_shared_lists(self, client, user, list_factory, settings):
+        settings.LIST_PAGE_SIZE = 2
+        owned = list_factory(owner=user)
+        shared = list_factory()
+        shared.shared_with.add(user)
+        list_factory(owner=user)
+
+        data = client.get(f"/api/v1/users/{user.email.upper()}/lists/").json()
+
+        assert data["owner"] == user.email
+        assert [list_["id"] for list_ in data["lists"]] == [owned.pk, shared.pk]
+        assert data["lists"][1]["owner"] == shared.owner.email
+        assert data["next"] is not None
+
+    def test_returns_404_if_user_doesnt_exist(self, client):
+        assert client.get("/api/v1/users/nobody@example.com/lists/").status_code == 404
+
+    @pytest.mark.query_budget(2)
+    def test_number_of_queries_doesnt_depend_on_number_of_lists(self, client, user, item_factory, query_budget):
+        for _ in range(3):
+            item_factory(list__owner=user)
+            item_factory().list.shared_with.add(user)
+
+        with query_budget():
+            client.get(f"/api/v1/users/{user.email}/lists/")
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+
+from lists import async_views
+
+
+@pytest.mark.parametrize("view", [async_views.home_page, async_views.view_list, async_views.my_lists])
+def test_views_are_async(view):
+    assert asyncio.iscoroutinefunction(view)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncViews:
+    def test_home_page(self, rf, home_url):
+        response = async_to_sync(async_views.home_page)(rf.get(home_url))
+
+        assert response.status_code == 200
+
+    def test_view_list(self, rf, item):
+        request = rf.get(f"/lists/{item.list.pk}/")
+        request.user = AnonymousUser()
+
+        response = async_to_sync(async_views.view_list)(request, pk=item.list.pk)
+
+        assert response.status_code == 200
+        assert item.text.encode() in response.content
+
+    def test_my_lists(self, rf, item):
+        owner = item.list.owner
+        request = rf.get(f"/lists/users/{owner.email}/")
+        request.user = AnonymousUser()
+
+        response = async_to_sync(async_views.my_lists)(request, email=owner.email)
+
+        assert response.status_code == 200
+        assert item.text.encode() in response.content
@@ -0,0 +1,69 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from lists.models import List
+
+
+@pytest.mark.django_db
+class TestImportItems:
+    def test_imports_items_from_file(self, list, tmp_path, capsys):
+        path = tmp_path / "items.ndjson"
+        path.write_text('"first"\n{"text": "second"}\n"first"\n')
+
+        call_command("import_items", list.pk, str(path))
+
+        assert [item.text for item in list.items.all()] == ["first", "second"]
+        assert "Accepted 2, duplicates 1, rejected 0." in capsys.readouterr().out
+
+    def test_errors_if_list_doesnt_exist(self, tmp_path):
+        with pytest.raises(CommandError, match="List 1 doesn't exist"):
+            call_command("import_items", 1, str(tmp_path / "items.csv"))
+
+    def test_errors_if_format_cant_be_inferred(self, list, tmp_path):
+        with pytest.raises(CommandError, match="--format"):
+            call_command("import_items", list.pk, str(tmp_path / "items.txt"))
+
+
+@pytest.mark.django_db
+class TestBackfillListSummaries:
+    def test_updates_every_list(self, item_factory, capsys):
+        items = item_factory.create_batch(3)
+        List.objects.update(name="", item_count=0)
+
+        call_command("backfill_list_summaries", batch_size=2)
+
+        for item in items:
+            item.list.refresh_from_db()
+            assert item.list.name == item.text
+            assert item.list.item_count == 1
+        assert "Updated 3 lists." in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestSeedData:
+    def test_creates_rows(self, capsys):
+        call_command("seed_data", "--users=3", "--lists-per-user=2", "--items-per-list=uniform:1:5")
+
+        assert List.objects.count() == 6
+        assert "Created 3 users, 6 lists" in capsys.readouterr().out
+
+    def test_errors_if_distribution_is_invalid(self):
+        with pytest.raises(CommandError, match="unknown distribution"):
+            call_command("seed_data", "--items-per-list", "normal:3")
+
+
+class TestSqliteMaintenance:
+    @pytest.mark.django_db(transaction=True)
+    def test_checkpoints_and_optimizes(self, capsys):
+        call_command("sqlite_maintenance")
+
+        # The test database is in memory, so it doesn't use WAL.
+        output = capsys.readouterr().out
+        assert "The database isn't in WAL mode" in output
+        assert "Optimized the database." in output
+
+    def test_errors_if_database_isnt_sqlite(self, mocker):
+        mocker.patch("django.db.connection.vendor", "postgresql")
+
+        with pytest.raises(CommandError, match="isn't an SQLite database"):
+            call_command("sqlite_maintenance")
@@ -1,6 +1,7 @@
 import pytest
 from django import forms
-from django.db import models
+from django.db import connection, models, transaction
+from django.test.utils import CaptureQueriesContext
 
 from lists.forms import ItemForm, NewListForm, PlaceholdersMixin, ShareListForm
 from lists.models import Item, List
@@ -36,8 +37,40 @@ class TestItemForm:
     def test_validation_error_for_duplicate_list_item(self, item):
         form = ItemForm({"text": item.text}, list_=item.list)
 
+        assert form.is_valid()
+        assert form.save() is None
         assert not form.is_valid()
         assert form.errors["text"] == ["You can't save a duplicate item"]
+        assert Item.objects.count() == 1
+
+    @pytest.mark.django_db
+    def test_duplicate_list_item_doesnt_update_list(self, item):
+        form = ItemForm({"text": item.text}, list_=item.list)
+        form.is_valid()
+        form.save()
+
+        item.list.refresh_from_db()
+        assert item.list.item_count == 1
+        assert item.list.version == 1
+
+    @pytest.mark.django_db
+    def test_duplicate_list_item_doesnt_break_transaction(self, item):
+        with transaction.atomic():
+            form = ItemForm({"text": item.text}, list_=item.list)
+            form.is_valid()
+            form.save()
+
+            assert Item.objects.count() == 1
+
+    @pytest.mark.django_db
+    def test_saving_doesnt_check_for_duplicates_beforehand(self, list):
+        form = ItemForm({"text": "New item text"}, list_=list)
+
+        with CaptureQueriesContext(connection) as context:
+            form.is_valid()
+            form.save()
+
+        assert not [query for query in context.captured_queries if query["sql"].startswith("SELECT")]
 
 
 def test_placeholders_mixin():
@@ -111,27 +144,29 @@ class TestShareListForm:
         return ShareListForm(data={"sharee": "john.smith@gmail.com"}, list_id=1, sharer=mock_user)
 
     @pytest.fixture
-    def mock_User_objects_exists_with_email(self, mocker):
-        """A mock User.objects.exists_with_email."""
-        return mocker.patch("lists.forms.User.objects.exists_with_email", autospec=True)
+    def mock_User_objects_in_bulk(self, mocker):
+        """A mock User.objects.in_bulk which finds a user for every email."""
+        return mocker.patch(
+            "lists.forms.User.objects.in_bulk",
+            autospec=True,
+            side_effect=lambda emails, field_name: {email: mocker.Mock(User, email=email) for email in emails},
+        )
 
     @pytest.fixture
     def mock_List_objects_get(self, mocker):
         """A mock List.objects.get."""
         return mocker.patch("lists.forms.List.objects.get", autospec=True)
 
-    def test_save_shares_list_with_sharee(
-        self, form, mock_List_objects_share_list, mock_User_objects_exists_with_email
-    ):
-        mock_User_objects_exists_with_email.return_value = True
+    def test_save_shares_list_with_sharee(self, form, mock_List_objects_share_list, mock_User_objects_in_bulk):
         form.is_valid()
 
         form.save()
 
-        mock_List_objects_share_list.assert_called_once_with(sharee="john.smith@gmail.com", list_id=1)
+        (sharee,) = form.cleaned_data["sharee"]
+        assert sharee.email == "john.smith@gmail.com"
+        mock_List_objects_share_list.assert_called_once_with(sharees=[sharee], list_id=1)
 
-    def test_save_returns_list(self, form, mock_List_objects_share_list, mock_User_objects_exists_with_email):
-        mock_User_objects_exists_with_email.return_value = True
+    def test_save_returns_list(self, form, mock_List_objects_share_list, mock_User_objects_in_bulk):
         form.is_valid()
 
         assert form.save() == mock_List_objects_share_list.return_value
@@ -140,13 +175,67 @@ class TestShareListForm:
         assert form.list == mock_List_objects_get.return_value
         mock_List_objects_get.assert_called_once_with(pk=1)
 
-    def test_sharee_has_error_if_user_with_email_doesnt_exist(self, form, mock_User_objects_exists_with_email):
-        mock_User_objects_exists_with_email.return_value = False
+    @pytest.mark.parametrize(
+        "sharee",
+        [
+            "a@example.com,b@example.com,c@example.com",
+            "a@example.com; b@example.com ;c@example.com",
+            "a@example.com\nb@example.com c@example.com",
+            ", a@example.com, b@example.com, a@example.com, c@example.com,",
+        ],
+    )
+    def test_splits_sharee_into_emails(self, mock_user, mock_User_objects_in_bulk, sharee):
+        form = ShareListForm(data={"sharee": sharee}, list_id=1, sharer=mock_user)
+
+        assert form.is_valid()
+        emails = [user.email for user in form.cleaned_data["sharee"]]
+        assert emails == ["a@example.com", "b@example.com", "c@example.com"]
+
+    def test_looks_up_users_in_one_query(self, mock_user, mock_User_objects_in_bulk):
+        form = ShareListForm(data={"sharee": "a@example.com, b@example.com"}, list_id=1, sharer=mock_user)
+        form.is_valid()
+
+        mock_User_objects_in_bulk.assert_called_once_with(["a@example.com", "b@example.com"], field_name="email")
+
+    def test_lowercases_emails(self, mock_user, mock_User_objects_in_bulk):
+        form = ShareListForm(data={"sharee": "Bob@Example.com, bob@example.com"}, list_id=1, sharer=mock_user)
+        form.is_valid()
+
+        mock_User_objects_in_bulk.assert_called_once_with(["bob@example.com"], field_name="email")
 
-        assert "This user doesn't have an account." in form.errors["sharee"]
+    def test_sharee_has_error_if_no_emails_entered(self, mock_user, mock_User_objects_in_bulk):
+        form = ShareListForm(data={"sharee": " , ; "}, list_id=1, sharer=mock_user)
 
-    def test_sharee_has_error_if_sharee_is_same_as_sharer(self, form, mock_user, mock_User_objects_exists_with_email):
-        mock_User_objects_exists_with_email.return_value = True
+        assert form.errors["sharee"] == ["This field is required."]
+        mock_User_objects_in_bulk.assert_not_called()
+
+    def test_sharee_has_error_if_user_with_email_doesnt_exist(self, form, mock_User_objects_in_bulk):
+        mock_User_objects_in_bulk.side_effect = None
+        mock_User_objects_in_bulk.return_value = {}
+
+        assert "john.smith@gmail.com doesn't have an account." in form.errors["sharee"]
+
+    def test_sharee_has_error_for_each_email_which_cant_be_shared_with(
+        self, mock_user, mock_User_objects_in_bulk, mocker
+    ):
+        mock_user.email = "owner@example.com"
+        mock_User_objects_in_bulk.side_effect = None
+        mock_User_objects_in_bulk.return_value = {
+            "a@example.com": mocker.Mock(User),
+            "owner@example.com": mock_user,
+        }
+        sharee = "a@example.com, b@example.com, owner@example.com, c@example.com"
+        form = ShareListForm(data={"sharee": sharee}, list_id=1, sharer=mock_user)
+
+        assert form.errors["sharee"] == [
+            "b@example.com doesn't have an account.",
+            "You already own this list.",
+            "c@example.com doesn't have an account.",
+        ]
+
+    def test_sharee_has_error_if_sharee_is_same_as_sharer(self, form, mock_user, mock_User_objects_in_bulk):
         mock_user.email = "john.smith@gmail.com"
 
         assert "You already own this list." in form.errors["sharee"]
+
+        assert "You already own this list." in form.errors["sharee"]
@@ -0,0 +1,85 @@
+from unittest.mock import DEFAULT
+
+import pytest
+
+from lists import imports
+from lists.models import Item
+
+
+class TestFormatFromFilename:
+    @pytest.mark.parametrize(
+        "filename,format",
+        [("items.csv", "csv"), ("items.CSV", "csv"), ("items.ndjson", "ndjson"), ("items.jsonl", "ndjson")],
+    )
+    def test_known_extensions(self, filename, format):
+        assert imports.format_from_filename(filename) == format
+
+    def test_unknown_extension(self):
+        assert imports.format_from_filename("items.txt") is None
+
+
+class TestParseCsv:
+    def test_yields_first_column(self):
+        assert list(imports.parse_csv(["first,ignored\n", "second\n"])) == ["first", "second"]
+
+    def test_skips_header_and_blank_rows(self):
+        assert list(imports.parse_csv(["text\n", "\n", "first\n"])) == ["first"]
+
+    def test_handles_quoted_newlines(self):
+        assert list(imports.parse_csv(['"multi\n', 'line"\n'])) == ["multi\nline"]
+
+
+class TestParseNdjson:
+    def test_yields_strings_and_text_keys(self):
+        lines = ['"first"\n', '{"text": "second"}\n']
+        assert list(imports.parse_ndjson(lines)) == ["first", "second"]
+
+    def test_yields_None_for_invalid_lines(self):
+        lines = ["not json\n", '{"txet": "typo"}\n', "1\n"]
+        assert list(imports.parse_ndjson(lines)) == [None, None, None]
+
+    def test_skips_blank_lines(self):
+        assert list(imports.parse_ndjson(["\n", '"first"\n'])) == ["first"]
+
+
+@pytest.mark.django_db
+class TestImportItems:
+    def test_saves_items_in_order(self, list):
+        imports.import_items(list, ["first", "second", "third"])
+
+        assert [item.text for item in Item.objects.filter(list=list)] == ["first", "second", "third"]
+
+    def test_counts_duplicates_in_list_and_input(self, item):
+        result = imports.import_items(item.list, [item.text, "new", "new"])
+
+        assert result == imports.ImportResult(accepted=1, duplicates=2, rejected=0)
+        assert item.list.items.count() == 2
+
+    def test_counts_duplicates_across_batches(self, list):
+        result = imports.import_items(list, ["a", "b", "a", "c"], batch_size=2)
+
+        assert result == imports.ImportResult(accepted=3, duplicates=1, rejected=0)
+
+    def test_counts_items_added_concurrently_as_duplicates(self, list, item_factory, mocker):
+        item_factory(list=list, text="b")
+        # The first lookup of the existing texts happens before another
+        # request adds "b", so doesn't find it.
+        filter = mocker.patch.object(Item.objects, "filter", wraps=Item.objects.filter)
+        filter.side_effect = lambda **kwargs: Item.objects.none() if filter.call_count == 1 else DEFAULT
+
+        result = imports.import_items(list, ["a", "b", "c"])
+
+        assert result == imports.ImportResult(accepted=2, duplicates=1, rejected=0)
+        assert sorted(list.items.values_list("text", flat=True)) == ["a", "b", "c"]
+
+    def test_rejects_empty_texts(self, list):
+        result = imports.import_items(list, ["", "  ", None, "ok"])
+
+        assert result == imports.ImportResult(accepted=1, duplicates=0, rejected=3)
+        assert list.items.get().text == "ok"
+
+    def test_queries_once_per_batch(self, list, django_assert_num_queries):
+        # One query each for the existing texts, the insert and the list's
+        # summary, plus a savepoint and its release.
+        with django_assert_num_queries(10):
+            imports.import_items(list, [f"item {i}" for i in range(10)], batch_size=5)
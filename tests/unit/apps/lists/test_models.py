@@ -32,14 +32,152 @@ class TestList:
     def test_name_is_first_item_text(self, item):
         assert item.list.name == item.text
 
+    def test_name_and_item_count_are_saved(self, list, item_factory):
+        item_factory(list=list, text="first")
+        item_factory(list=list, text="second")
+
+        list.refresh_from_db()
+        assert list.name == "first"
+        assert list.item_count == 2
+        assert list.version == 2
+
+    def test_modified_is_updated_when_item_saved(self, list, item_factory):
+        modified = list.modified
+        item_factory(list=list)
+
+        list.refresh_from_db()
+        assert list.modified > modified
+
+    def test_name_and_item_count_are_updated_when_item_deleted(self, list, item_factory):
+        first_item = item_factory(list=list, text="first")
+        item_factory(list=list, text="second")
+
+        first_item.delete()
+
+        list.refresh_from_db()
+        assert list.name == "second"
+        assert list.item_count == 1
+
+    def test_name_and_item_count_are_updated_by_bulk_create(self, list):
+        Item.objects.bulk_create([Item(list=list, text="first"), Item(list=list, text="second")])
+
+        list.refresh_from_db()
+        assert list.name == "first"
+        assert list.item_count == 2
+
+    def test_name_and_item_count_are_updated_by_queryset_delete(self, list, item_factory):
+        item_factory(list=list, text="first")
+        item_factory(list=list, text="second")
+
+        list.items.all().delete()
+
+        list.refresh_from_db()
+        assert list.name == ""
+        assert list.item_count == 0
+
 
 @pytest.mark.django_db
 class TestListManager:
-    def test_share_list_adds_user_to_shared_with(self, list, user):
-        List.objects.share_list(user.email, list.pk)
+    def test_visible_to_returns_owned_and_shared_lists(self, user, list_factory):
+        owned = list_factory(owner=user)
+        shared = list_factory()
+        shared.shared_with.add(user)
+        list_factory()
+
+        assert set(List.objects.visible_to(user)) == {owned, shared}
+
+    def test_visible_to_returns_each_list_once(self, user, list_factory, user_factory):
+        list_ = list_factory(owner=user)
+        list_.shared_with.add(user, user_factory())
+
+        assert list(List.objects.visible_to(user)) == [list_]
+
+    def test_visible_to_makes_one_query(self, user, list_factory, django_assert_num_queries):
+        for _ in range(3):
+            list_factory(owner=user)
+            list_factory().shared_with.add(user)
+
+        with django_assert_num_queries(1):
+            lists = list(List.objects.visible_to(user))
+
+        assert len(lists) == 6
+
+    def test_visible_to_can_be_ordered_and_sliced(self, user, list_factory):
+        lists = [list_factory(owner=user) for _ in range(3)]
+        for list_ in list_factory.create_batch(2):
+            list_.shared_with.add(user)
+            lists.append(list_)
+
+        assert list(List.objects.visible_to(user).order_by("-pk")[1:4]) == lists[3:0:-1]
+
+    def test_share_list_adds_users_to_shared_with(self, list, user_factory):
+        users = user_factory.create_batch(3)
 
-        assert list.shared_with.count() == 1
-        assert list.shared_with.first() == user
+        List.objects.share_list(users, list.pk)
+
+        assert set(list.shared_with.all()) == set(users)
+
+    def test_share_list_ignores_users_already_shared_with(self, list, user_factory):
+        users = user_factory.create_batch(2)
+        list.shared_with.add(users[0])
+
+        List.objects.share_list(users, list.pk)
+
+        assert set(list.shared_with.all()) == set(users)
+
+    def test_share_list_adds_users_in_one_insert(self, list, user_factory, django_assert_num_queries):
+        users = user_factory.create_batch(3)
+
+        # Includes the savepoint around the insert and update and its release.
+        with django_assert_num_queries(5) as captured:
+            List.objects.share_list(users, list.pk)
+
+        inserts = [query for query in captured.captured_queries if query["sql"].startswith("INSERT")]
+        assert len(inserts) == 1
+
+    def test_share_list_bumps_version(self, list, user):
+        List.objects.share_list([user], list.pk)
+
+        list.refresh_from_db()
+        assert list.version == 1
+
+    def test_share_list_updates_modified(self, list, user):
+        modified = list.modified
+        List.objects.share_list([user], list.pk)
+
+        list.refresh_from_db()
+        assert list.modified > modified
 
     def test_share_list_returns_shared_list(self, list, user):
-        assert List.objects.share_list(user.email, list.pk) == list
+        assert List.objects.share_list([user], list.pk) == list
+
+
+@pytest.mark.django_db
+class TestUserSignals:
+    @pytest.fixture
+    def shared_list(self, list_factory, user):
+        list_ = list_factory()
+        list_.shared_with.add(user)
+        return list_
+
+    def test_saving_user_bumps_versions_of_visible_lists(self, user, list_factory, shared_list):
+        owned = list_factory(owner=user)
+        other = list_factory()
+
+        user.save()
+
+        for list_, version in [(owned, 1), (shared_list, 1), (other, 0)]:
+            list_.refresh_from_db()
+            assert list_.version == version
+
+    def test_saving_other_fields_of_user_doesnt_bump_versions(self, user, shared_list):
+        user.save(update_fields=["last_login"])
+
+        shared_list.refresh_from_db()
+        assert shared_list.version == 0
+
+    def test_deleting_user_bumps_versions_of_shared_lists(self, user, shared_list):
+        user.delete()
+
+        shared_list.refresh_from_db()
+        assert shared_list.version == 1
@@ -0,0 +1,142 @@
+import pytest
+from django.http import QueryDict
+
+from lists.models import Item
+from lists.pagination import KeysetPage, OffsetPage, last_page_query
+
+
+@pytest.fixture
+def items(list, item_factory):
+    """Five items in a list."""
+    return item_factory.create_batch(5, list=list)
+
+
+@pytest.fixture
+def page_factory(list):
+    """Function which returns a page of a list's items with a page size of 2."""
+
+    def page_factory(query=""):
+        return KeysetPage(Item.objects.filter(list=list), 2, QueryDict(query))
+
+    return page_factory
+
+
+@pytest.mark.django_db
+class TestKeysetPage:
+    def test_first_page(self, items, page_factory):
+        page = page_factory()
+
+        assert page.items == items[:2]
+        assert page.start == 1
+        assert page.has_next
+        assert not page.has_previous
+
+    def test_next_page(self, items, page_factory):
+        page = page_factory(page_factory().next_query)
+
+        assert page.items == items[2:4]
+        assert page.start == 3
+        assert page.has_next
+        assert page.has_previous
+
+    def test_last_page(self, items, page_factory):
+        page = page_factory(f"after={items[3].pk}&start=5")
+
+        assert page.items == items[4:]
+        assert not page.has_next
+        assert page.has_previous
+
+    def test_previous_page(self, items, page_factory):
+        page = page_factory(page_factory(f"after={items[3].pk}&start=5").previous_query)
+
+        assert page.items == items[2:4]
+        assert page.start == 3
+        assert page.has_next
+        assert page.has_previous
+
+    def test_previous_page_reaching_first_item(self, items, page_factory):
+        page = page_factory(f"before={items[2].pk}&start=1")
+
+        assert page.items == items[:2]
+        assert not page.has_previous
+
+    def test_last_page_before_cursor_past_last_item(self, items, page_factory):
+        page = page_factory(f"before={items[4].pk + 1}&start=4")
+
+        assert page.items == items[3:]
+        assert not page.has_next
+        assert page.has_previous
+
+    def test_page_before_first_item_is_empty(self, items, page_factory):
+        page = page_factory(f"before={items[0].pk}&start=3")
+
+        assert page.items == []
+        assert not page.has_next
+        assert not page.has_previous
+
+    def test_page_after_last_item_is_empty(self, items, page_factory):
+        page = page_factory(f"after={items[4].pk}&start=6")
+
+        assert page.items == []
+        assert not page.has_next
+        assert page.has_previous
+        assert page.previous_query == f"before={items[4].pk + 1}&start=4"
+
+    def test_invalid_params_give_first_page(self, items, page_factory):
+        page = page_factory("after=foo&start=-1")
+
+        assert page.items == items[:2]
+        assert page.start == 1
+
+    def test_queries_items_once(self, items, page_factory, django_assert_num_queries):
+        page = page_factory(f"after={items[1].pk}&start=3")
+
+        with django_assert_num_queries(1):
+            page.items
+            page.has_next
+            page.has_previous
+
+    def test_checks_for_next_page_once_when_paging_backwards(self, items, page_factory, django_assert_num_queries):
+        page = page_factory(f"before={items[3].pk}&start=2")
+
+        with django_assert_num_queries(2):
+            page.items
+            page.has_next
+            page.has_next
+            page.has_previous
+
+
+class TestOffsetPage:
+    @pytest.fixture
+    def page_factory(self):
+        """Function which returns a page of five results with a page size of 2."""
+
+        def page_factory(query=""):
+            return OffsetPage(lambda limit, offset: list(range(5))[offset:][:limit], 2, QueryDict(query), {"q": "a"})
+
+        return page_factory
+
+    def test_first_page(self, page_factory):
+        page = page_factory()
+
+        assert page.items == [0, 1]
+        assert page.start == 1
+        assert page.has_next
+        assert not page.has_previous
+        assert page.next_query == "q=a&page=2"
+
+    def test_last_page(self, page_factory):
+        page = page_factory("page=3")
+
+        assert page.items == [4]
+        assert page.start == 5
+        assert not page.has_next
+        assert page.has_previous
+        assert page.previous_query == "q=a&page=2"
+
+    def test_invalid_page_gives_first_page(self, page_factory):
+        assert page_factory("page=0").items == [0, 1]
+
+
+def test_last_page_query():
+    assert last_page_query(last_item_pk=10, item_count=7, page_size=5) == "before=11&start=3"
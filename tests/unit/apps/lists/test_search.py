@@ -0,0 +1,116 @@
+import pytest
+from django.db import connection
+from django.http import QueryDict
+
+from lists import search
+from lists.models import Item
+
+
+def texts(page):
+    return [item.text for item in page.items]
+
+
+@pytest.fixture
+def search_items(user):
+    """Function which returns a page of the user's search results with a page size of 2."""
+
+    def search_items(text, query=""):
+        return search.search_items(user, text, 2, QueryDict(query))
+
+    return search_items
+
+
+@pytest.fixture(params=["sqlite", "fallback"])
+def vendor(request, mocker):
+    """Runs a test with both the full text index and the fallback."""
+    if request.param == "fallback":
+        mocker.patch.object(connection, "vendor", "unknown")
+    return request.param
+
+
+def test_parse_terms():
+    assert search.parse_terms("Buy  MILK, then eggs!") == ["buy", "milk", "then", "eggs"]
+
+
+def test_sqlite_query():
+    assert search.sqlite_query(["buy", "mil"]) == '"buy" "mil"*'
+
+
+def test_postgresql_query():
+    assert search.postgresql_query(["buy", "mil"]) == "buy & mil:*"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("vendor")
+class TestSearchItems:
+    def test_finds_items_in_owned_and_shared_lists(self, search_items, user, item_factory):
+        owned = item_factory(text="buy milk", list__owner=user)
+        shared = item_factory(text="milk the cow")
+        shared.list.shared_with.add(user)
+        item_factory(text="spilt milk")
+
+        assert sorted(texts(search_items("milk"))) == sorted([owned.text, shared.text])
+
+    def test_matches_all_words(self, search_items, user, item_factory):
+        item_factory(text="buy milk", list__owner=user)
+        item_factory(text="buy eggs", list__owner=user)
+
+        assert texts(search_items("buy eggs")) == ["buy eggs"]
+
+    def test_matches_prefix_of_last_word(self, search_items, user, item_factory):
+        item_factory(text="buy milk", list__owner=user)
+
+        assert texts(search_items("bu")) == ["buy milk"]
+
+    def test_no_results_for_empty_search(self, search_items, user, item_factory, django_assert_num_queries):
+        item_factory(text="buy milk", list__owner=user)
+
+        with django_assert_num_queries(0):
+            assert texts(search_items(" ,")) == []
+
+    def test_paginates(self, search_items, user, item_factory):
+        list_ = item_factory(text="milk 1", list__owner=user).list
+        item_factory(text="milk 2", list=list_)
+        item_factory(text="milk 3", list=list_)
+
+        first_page = search_items("milk")
+        second_page = search_items("milk", first_page.next_query)
+
+        assert len(first_page.items) == 2
+        assert first_page.has_next
+        assert len(second_page.items) == 1
+        assert not second_page.has_next
+        assert second_page.previous_query == "q=milk&page=1"
+
+
+@pytest.mark.django_db
+class TestFullTextIndex:
+    def test_ranks_better_matches_first(self, search_items, user, item_factory):
+        list_ = item_factory(text="milk", list__owner=user).list
+        item_factory(text="milk and some other things to buy", list=list_)
+
+        assert texts(search_items("milk")) == ["milk", "milk and some other things to buy"]
+
+    def test_matches_other_forms_of_words(self, search_items, user, item_factory):
+        item_factory(text="walking the dog", list__owner=user)
+
+        assert texts(search_items("walked")) == ["walking the dog"]
+
+    def test_is_updated_when_items_are_bulk_created(self, search_items, user, list_factory):
+        list_ = list_factory(owner=user)
+        Item.objects.bulk_create([Item(list=list_, text="buy milk")])
+
+        assert texts(search_items("milk")) == ["buy milk"]
+
+    def test_is_updated_when_items_are_updated(self, search_items, user, item_factory):
+        item = item_factory(text="buy milk", list__owner=user)
+        Item.objects.filter(pk=item.pk).update(text="buy eggs")
+
+        assert texts(search_items("milk")) == []
+        assert texts(search_items("eggs")) == ["buy eggs"]
+
+    def test_is_updated_when_items_are_deleted(self, search_items, user, item_factory):
+        item = item_factory(text="buy milk", list__owner=user)
+        item.delete()
+
+        assert texts(search_items("milk")) == []
@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from lists import seeding
+from lists.models import Item, List
+from users.models import User
+
+
+class TestDistribution:
+    @pytest.mark.parametrize("spec", ["3", "constant:3", "uniform:3:3", "poisson:0", "exponential:0"])
+    def test_samples(self, spec):
+        expected = 0 if spec.endswith(":0") else 3
+        assert seeding.distribution(spec)(random.Random()) == expected
+
+    def test_uniform_samples_within_bounds(self):
+        sample = seeding.distribution("uniform:2:5")
+        rng = random.Random(0)
+        assert {sample(rng) for _ in range(100)} == {2, 3, 4, 5}
+
+    @pytest.mark.parametrize("mean", [4, 100])
+    def test_poisson_mean(self, mean):
+        sample = seeding.distribution(f"poisson:{mean}")
+        rng = random.Random(0)
+        assert sum(sample(rng) for _ in range(2000)) / 2000 == pytest.approx(mean, rel=0.1)
+
+    @pytest.mark.parametrize(
+        "spec", ["normal:3", "uniform:1", "poisson:a", "constant:-1", "uniform:5:2", "constant:1:2", ""]
+    )
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError):
+            seeding.distribution(spec)
+
+
+@pytest.mark.django_db
+class TestSeed:
+    def test_creates_rows(self):
+        result = seeding.seed(
+            users=5,
+            lists_per_user=seeding.distribution("2"),
+            items_per_list=seeding.distribution("3"),
+            shares_per_list=seeding.distribution("2"),
+            batch_size=4,
+        )
+
+        assert result == seeding.SeedResult(users=5, lists=10, items=30, shares=20)
+        assert User.objects.count() == 5
+        assert Item.objects.count() == 30
+        assert List.shared_with.through.objects.count() == 20
+
+    def test_lists_have_correct_summaries(self):
+        seeding.seed(
+            users=3,
+            lists_per_user=seeding.distribution("uniform:0:3"),
+            items_per_list=seeding.distribution("uniform:0:4"),
+            shares_per_list=seeding.distribution("1"),
+            batch_size=2,
+            rng=random.Random(0),
+        )
+
+        summaries = {list_.pk: (list_.name, list_.item_count) for list_ in List.objects.all()}
+        List.objects.refresh_summaries()
+        assert {list_.pk: (list_.name, list_.item_count) for list_ in List.objects.all()} == summaries
+
+    def test_lists_arent_shared_with_owner(self):
+        seeding.seed(
+            users=2,
+            lists_per_user=seeding.distribution("5"),
+            items_per_list=seeding.distribution("1"),
+            shares_per_list=seeding.distribution("3"),
+        )
+
+        for list_ in List.objects.all():
+            assert list(list_.shared_with.all()) == list(User.objects.exclude(pk=list_.owner_id))
+
+    def test_users_can_log_in(self, client):
+        seeding.seed(
+            users=2,
+            lists_per_user=seeding.distribution("0"),
+            items_per_list=seeding.distribution("0"),
+            shares_per_list=seeding.distribution("0"),
+            password="secret",
+        )
+
+        for user in User.objects.all():
+            assert client.login(username=user.email, password="secret")
+
+    def test_calls_progress_after_each_batch(self):
+        progress = []
+
+        seeding.seed(
+            users=3,
+            lists_per_user=seeding.distribution("1"),
+            items_per_list=seeding.distribution("1"),
+            shares_per_list=seeding.distribution("0"),
+            batch_size=2,
+            progress=progress.append,
+        )
+
+        assert progress == [
+            seeding.SeedResult(users=2, lists=0, items=0, shares=0),
+            seeding.SeedResult(users=3, lists=0, items=0, shares=0),
+            seeding.SeedResult(users=3, lists=2, items=2, shares=0),
+            seeding.SeedResult(users=3, lists=3, items=3, shares=0),
+        ]
@@ -1,10 +1,14 @@
+import json
 from unittest import mock
 
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils.http import http_date
 
 from lists.forms import ItemForm, ShareListForm
 from lists.models import Item, List
 from lists.views import new_list, share_list
+from users.backends import CachedModelBackend
 
 
 @pytest.fixture
@@ -60,11 +64,150 @@ class TestViewList:
     def test_passes_list_to_template(self, get_response, list):
         assert get_response.context["list"] == list
 
+    @pytest.mark.query_budget(3)
+    def test_GET_is_within_query_budget(self, client, view_list_url, list, item_factory, user_factory, query_budget):
+        item_factory.create_batch(3, list=list)
+        list.shared_with.add(*user_factory.create_batch(3))
+
+        with query_budget():
+            client.get(view_list_url)
+
+    @pytest.mark.query_budget(5)
+    def test_logged_in_GET_is_within_query_budget(self, client, view_list_url, list, item_factory, query_budget):
+        item_factory.create_batch(3, list=list)
+        client.force_login(list.owner)
+
+        with query_budget():
+            client.get(view_list_url)
+
+    @pytest.mark.query_budget(4)
+    def test_logged_in_GET_with_cached_user_is_within_query_budget(
+        self, client, view_list_url, list, item_factory, settings, query_budget
+    ):
+        settings.USER_CACHE_TIMEOUT = 300
+        item_factory.create_batch(3, list=list)
+        client.force_login(list.owner)
+        CachedModelBackend().get_user(list.owner.pk)
+
+        with query_budget():
+            client.get(view_list_url)
+
+    @pytest.mark.query_budget(1)
+    def test_cached_GET_is_within_query_budget(self, client, view_list_url, list, item_factory, query_budget):
+        item_factory.create_batch(3, list=list)
+        client.get(view_list_url)
+
+        with query_budget():
+            client.get(view_list_url)
+
+    def test_cached_items_are_invalidated_when_item_added(self, client, view_list_url, list, item_factory):
+        client.get(view_list_url)
+        item_factory(list=list, text="A new list item")
+
+        assert b"A new list item" in client.get(view_list_url).content
+
+    def test_cached_sharees_are_invalidated_when_list_shared(self, client, view_list_url, list, user):
+        client.get(view_list_url)
+        List.objects.share_list([user], list.pk)
+
+        assert user.email.encode() in client.get(view_list_url).content
+
+    def test_page_before_first_item_is_empty(self, client, view_list_url, list, item_factory):
+        items = item_factory.create_batch(2, list=list)
+
+        response = client.get(view_list_url, {"before": items[0].pk})
+
+        assert response.status_code == 200
+        assert response.context["page"].items == []
+
+    def test_GET_response_has_validators(self, get_response):
+        assert get_response.has_header("ETag")
+        assert not get_response.has_header("Last-Modified")
+        assert set(get_response["Cache-Control"].split(", ")) == {"private", "no-cache"}
+
+    @pytest.mark.query_budget(1)
+    def test_conditional_GET_with_unchanged_etag_is_not_modified(self, client, view_list_url, item, query_budget):
+        etag = client.get(view_list_url)["ETag"]
+
+        with query_budget():
+            response = client.get(view_list_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert not response.content
+
+    def test_conditional_GET_since_list_modified_depends_on_user(self, client, view_list_url, list, user):
+        client.get(view_list_url)
+        client.force_login(user)
+
+        response = client.get(view_list_url, HTTP_IF_MODIFIED_SINCE=http_date())
+
+        assert response.status_code == 200
+        assert user.email.encode() in response.content
+
+    def test_etag_changes_when_item_added(self, client, view_list_url, list, item_factory):
+        etag = client.get(view_list_url)["ETag"]
+        item_factory(list=list)
+
+        assert client.get(view_list_url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_etag_changes_when_list_shared(self, client, view_list_url, list, user):
+        etag = client.get(view_list_url)["ETag"]
+        List.objects.share_list([user], list.pk)
+
+        assert client.get(view_list_url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_etag_depends_on_user(self, client, view_list_url, list, user):
+        etag = client.get(view_list_url)["ETag"]
+        client.force_login(user)
+
+        assert client.get(view_list_url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_etag_depends_on_page(self, client, view_list_url, list, item_factory):
+        items = item_factory.create_batch(2, list=list)
+        etag = client.get(view_list_url)["ETag"]
+
+        response = client.get(view_list_url, {"after": items[0].pk, "start": 2}, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+
+    def test_cached_sharees_are_invalidated_when_sharee_email_changes(self, client, view_list_url, list, user):
+        List.objects.share_list([user], list.pk)
+        client.get(view_list_url)
+        user.email = "new-email@example.com"
+        user.save()
+
+        assert b"new-email@example.com" in client.get(view_list_url).content
+
+    def test_cached_sharees_are_invalidated_when_sharee_deleted(self, client, view_list_url, list, user_factory):
+        sharee = user_factory()
+        List.objects.share_list([sharee], list.pk)
+        client.get(view_list_url)
+        sharee.delete()
+
+        assert sharee.email.encode() not in client.get(view_list_url).content
+
+    def test_passes_page_of_items_to_template(self, client, view_list_url, list, item_factory, settings):
+        settings.LIST_PAGE_SIZE = 2
+        items = item_factory.create_batch(3, list=list)
+
+        response = client.get(view_list_url, {"after": items[1].pk, "start": 3})
+
+        page = response.context["page"]
+        assert page.items == [items[2]]
+        assert page.start == 3
+        assert b"<strong>3:</strong>" in response.content
+
     @pytest.fixture
     def success_response(self, client, view_list_url):
         """Response to a successful POST request to the view list page."""
         return client.post(view_list_url, {"text": "A new list item"})
 
+    # Includes the savepoint around the insert and its release.
+    @pytest.mark.query_budget(5)
+    def test_POST_is_within_query_budget(self, client, view_list_url, query_budget):
+        with query_budget():
+            client.post(view_list_url, {"text": "A new list item"})
+
     def test_can_save_a_POST_request_to_an_existing_list(self, success_response, list):
         saved_items = Item.objects
         assert saved_items.count() == 1
@@ -76,6 +219,35 @@ class TestViewList:
     def test_redirects_to_list_view(self, success_response, view_list_url, assert_redirects):
         assert_redirects(success_response, view_list_url)
 
+    def test_redirects_to_last_page_if_list_has_more_than_one_page(
+        self, client, view_list_url, list, item_factory, settings, assert_redirects
+    ):
+        settings.LIST_PAGE_SIZE = 2
+        item_factory.create_batch(2, list=list)
+
+        response = client.post(view_list_url, {"text": "A new list item"})
+
+        new_item = list.items.get(text="A new list item")
+        assert_redirects(response, f"{view_list_url}?before={new_item.pk + 1}&start=2")
+
+    def test_last_page_after_POST_has_no_next_page(self, client, view_list_url, list, item_factory, settings):
+        settings.LIST_PAGE_SIZE = 2
+        item_factory.create_batch(2, list=list)
+
+        response = client.post(view_list_url, {"text": "A new list item"}, follow=True)
+
+        page = response.context["page"]
+        assert [item.text for item in page.items][-1] == "A new list item"
+        assert not page.has_next
+        assert page.has_previous
+        assert b"pagination-next" not in response.content
+
+    def test_duplicate_item_renders_error(self, client, item):
+        response = client.post(item.list.get_absolute_url(), {"text": item.text})
+
+        assert response.status_code == 200
+        assert response.context["form"].errors["text"] == ["You can't save a duplicate item"]
+
     @pytest.fixture
     def invalid_form_response(self, client, view_list_url, mock_item_form_instance):
         """
@@ -122,6 +294,12 @@ class TestHome:
     def test_uses_item_form(self, get_response):
         assert isinstance(get_response.context["form"], ItemForm)
 
+    @pytest.mark.django_db
+    @pytest.mark.query_budget(0)
+    def test_GET_is_within_query_budget(self, client, home_url, query_budget):
+        with query_budget():
+            client.get(home_url)
+
     @pytest.mark.django_db
     def test_GET_doesnt_save_item(self, get_response):
         assert Item.objects.count() == 0
@@ -241,6 +419,73 @@ class TestMyLists:
     def test_passes_owner_to_template(self, get_response, user):
         assert get_response.context["owner"] == user
 
+    @pytest.mark.django_db
+    def test_finds_owner_by_email_in_any_case(self, client, user):
+        response = client.get(f"/lists/users/{user.email.upper()}/")
+
+        assert response.context["owner"] == user
+
+    @pytest.mark.django_db
+    def test_passes_page_of_owned_and_shared_lists_to_template(self, client, user, list_factory, settings):
+        settings.LIST_PAGE_SIZE = 2
+        owned = list_factory(owner=user)
+        shared = list_factory()
+        shared.shared_with.add(user)
+        list_factory(owner=user)
+
+        page = client.get(f"/lists/users/{user.email}/").context["page"]
+
+        assert page.items == [owned, shared]
+        assert page.has_next
+
+    # Includes the query for the ETag header.
+    @pytest.mark.django_db
+    @pytest.mark.query_budget(3)
+    def test_number_of_queries_doesnt_depend_on_number_of_lists(self, client, user, item_factory, query_budget):
+        for _ in range(3):
+            item_factory(list__owner=user)
+            item_factory().list.shared_with.add(user)
+
+        with query_budget():
+            client.get(f"/lists/users/{user.email}/")
+
+    @pytest.mark.django_db
+    @pytest.mark.query_budget(2)
+    def test_conditional_GET_with_unchanged_etag_is_not_modified(self, client, user, list_factory, query_budget):
+        list_factory(owner=user)
+        etag = client.get(f"/lists/users/{user.email}/")["ETag"]
+
+        with query_budget():
+            response = client.get(f"/lists/users/{user.email}/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    @pytest.mark.django_db
+    def test_conditional_GET_since_lists_modified_depends_on_user(self, client, user, list_factory):
+        list_factory(owner=user)
+        client.get(f"/lists/users/{user.email}/")
+        client.force_login(user)
+
+        response = client.get(f"/lists/users/{user.email}/", HTTP_IF_MODIFIED_SINCE=http_date())
+
+        assert response.status_code == 200
+
+    @pytest.mark.django_db
+    def test_etag_changes_when_list_shared_with_user(self, client, user, list_factory):
+        list_factory(owner=user)
+        etag = client.get(f"/lists/users/{user.email}/")["ETag"]
+        List.objects.share_list([user], list_factory().pk)
+
+        assert client.get(f"/lists/users/{user.email}/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    @pytest.mark.django_db
+    def test_etag_changes_when_item_added_to_list(self, client, user, item_factory):
+        item = item_factory(list__owner=user)
+        etag = client.get(f"/lists/users/{user.email}/")["ETag"]
+        item_factory(list=item.list)
+
+        assert client.get(f"/lists/users/{user.email}/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
 
 class TestShareList:
     @pytest.fixture
@@ -304,7 +549,7 @@ class TestShareList:
         mock_render.assert_called_once_with(
             post_request,
             list_template,
-            {"form": mock_ItemForm.return_value, "share_form": mock_form, "list": mock_form.list},
+            {"form": mock_ItemForm.return_value, "share_form": mock_form, "list": mock_form.list, "page": mock.ANY},
         )
         assert response == mock_render.return_value
 
@@ -318,6 +563,34 @@ class TestShareList:
         assert list.shared_with.count() == 1
         assert list.shared_with.first() == sharee
 
+    @pytest.mark.django_db
+    def test_list_is_shared_with_every_user_entered(self, share_url, client, list, user_factory):
+        sharer = user_factory()
+        sharees = user_factory.create_batch(3)
+        client.force_login(sharer)
+        client.post(share_url, {"sharee": ", ".join(sharee.email for sharee in sharees)})
+
+        assert set(list.shared_with.all()) == set(sharees)
+
+    # Doesn't depend on the number of sharees.
+    @pytest.mark.django_db
+    @pytest.mark.query_budget(8)
+    def test_POST_with_many_sharees_is_within_query_budget(self, share_url, client, list, user_factory, query_budget):
+        sharees = user_factory.create_batch(20)
+        client.force_login(user_factory())
+
+        with query_budget():
+            client.post(share_url, {"sharee": ", ".join(sharee.email for sharee in sharees)})
+
+        assert list.shared_with.count() == 20
+
+    @pytest.mark.django_db
+    def test_list_isnt_shared_if_any_user_doesnt_exist(self, share_url, client, list, user_factory):
+        client.force_login(user_factory())
+        client.post(share_url, {"sharee": f"{user_factory().email}, john.smith@gmail.com"})
+
+        assert list.shared_with.count() == 0
+
     @pytest.mark.django_db
     def test_list_isnt_shared_if_user_doesnt_exist(self, share_url, client, list, user):
         client.force_login(user)
@@ -331,3 +604,128 @@ class TestShareList:
 
         assert_redirects(response, login_url)
         assert list.shared_with.count() == 0
+
+
+@pytest.mark.django_db
+class TestSearch:
+    def test_redirects_to_login_page_if_user_not_logged_in(self, client, login_url, assert_redirects):
+        response = client.get("/lists/search/", {"q": "milk"})
+
+        assert_redirects(response, login_url)
+
+    def test_renders_matching_items(self, client, user, item_factory, assert_template_used):
+        item = item_factory(text="buy milk", list__owner=user)
+        item_factory(text="buy eggs", list__owner=user)
+        client.force_login(user)
+
+        response = client.get("/lists/search/", {"q": "milk"})
+
+        assert_template_used(response, "lists/search.html")
+        assert response.context["query"] == "milk"
+        assert response.context["page"].items == [item]
+        assert item.list.get_absolute_url().encode() in response.content
+
+    @pytest.mark.query_budget(4)
+    def test_GET_is_within_query_budget(self, client, user, item_factory, query_budget):
+        for i in range(3):
+            item_factory(text=f"buy milk {i}", list__owner=user)
+        client.force_login(user)
+
+        with query_budget():
+            client.get("/lists/search/", {"q": "milk"})
+
+
+@pytest.mark.django_db
+class TestImportItems:
+    @pytest.fixture
+    def import_url(self, list):
+        """URL of the import items view for a list."""
+        return f"/lists/{list.pk}/import/"
+
+    def test_imports_items_and_reports_counts(self, client, import_url, list):
+        file = SimpleUploadedFile("items.csv", b"text\nfirst\nsecond\nfirst\n\n,\n")
+        response = client.post(import_url, {"file": file})
+
+        assert response.status_code == 200
+        assert response.json() == {"accepted": 2, "duplicates": 1, "rejected": 1}
+        assert [item.text for item in list.items.all()] == ["first", "second"]
+
+    def test_format_can_be_given_explicitly(self, client, import_url, list):
+        file = SimpleUploadedFile("items.txt", b'{"text": "first"}\n')
+        response = client.post(import_url, {"file": file, "format": "ndjson"})
+
+        assert response.json() == {"accepted": 1, "duplicates": 0, "rejected": 0}
+
+    def test_returns_errors_if_format_unknown(self, client, import_url, list):
+        file = SimpleUploadedFile("items.txt", b"first\n")
+        response = client.post(import_url, {"file": file})
+
+        assert response.status_code == 400
+        assert "errors" in response.json()
+        assert list.items.count() == 0
+
+    def test_GET_not_allowed(self, client, import_url):
+        assert client.get(import_url).status_code == 405
+
+
+@pytest.mark.django_db
+class TestExportList:
+    @pytest.fixture
+    def export_url(self, list):
+        """URL of the export view for a list."""
+        return f"/lists/{list.pk}/export/"
+
+    @pytest.fixture
+    def shared_list(self, list, item_factory, user_factory):
+        """A list with two items which has been shared with a user."""
+        item_factory(list=list, text="first")
+        item_factory(list=list, text="second, with a comma")
+        list.shared_with.add(user_factory(email="sharee@example.com"))
+        return list
+
+    def test_exports_csv_by_default(self, client, export_url, shared_list):
+        response = client.get(export_url)
+
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv"
+        assert b"".join(response.streaming_content) == b'text\r\nfirst\r\n"second, with a comma"\r\n'
+        assert response["X-List-Owner"] == shared_list.owner.email
+        assert response["X-List-Shared-With"] == "sharee@example.com"
+
+    def test_exports_ndjson(self, client, export_url, shared_list):
+        response = client.get(export_url, {"format": "ndjson"})
+
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        assert lines == [
+            {
+                "list": shared_list.pk,
+                "name": "first",
+                "owner": shared_list.owner.email,
+                "shared_with": ["sharee@example.com"],
+            },
+            {"text": "first"},
+            {"text": "second, with a comma"},
+        ]
+
+    def test_unknown_format_is_bad_request(self, client, export_url):
+        assert client.get(export_url, {"format": "xml"}).status_code == 400
+
+    def test_not_modified_if_etag_matches(self, client, export_url, django_assert_num_queries):
+        etag = client.get(export_url)["ETag"]
+
+        with django_assert_num_queries(1):
+            response = client.get(export_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_etag_changes_when_item_added(self, client, export_url, list, item_factory):
+        etag = client.get(export_url)["ETag"]
+        item_factory(list=list)
+
+        assert client.get(export_url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_etag_changes_when_list_shared(self, client, export_url, list, user):
+        etag = client.get(export_url)["ETag"]
+        List.objects.share_list([user], list.pk)
+
+        assert client.get(export_url, HTTP_IF_NONE_MATCH=etag).status_code == 200
@@ -0,0 +1,53 @@
+import pytest
+
+from users.backends import CachedModelBackend
+
+
+@pytest.fixture
+def backend(settings):
+    settings.USER_CACHE_TIMEOUT = 300
+    return CachedModelBackend()
+
+
+@pytest.mark.django_db
+class TestCachedModelBackend:
+    def test_caches_user(self, backend, user, django_assert_num_queries):
+        backend.get_user(user.pk)
+
+        with django_assert_num_queries(0):
+            assert backend.get_user(user.pk) == user
+
+    def test_cached_user_is_invalidated_when_saved(self, backend, user):
+        backend.get_user(user.pk)
+        user.set_password("a new password")
+        user.save()
+
+        assert backend.get_user(user.pk).password == user.password
+
+    def test_cached_user_is_invalidated_when_deleted(self, backend, user):
+        backend.get_user(user.pk)
+        user.delete()
+
+        assert backend.get_user(user.pk) is None
+
+    def test_doesnt_cache_missing_user(self, backend, django_assert_num_queries):
+        backend.get_user(1)
+
+        with django_assert_num_queries(1):
+            backend.get_user(1)
+
+    def test_doesnt_cache_if_timeout_is_0(self, backend, user, settings, django_assert_num_queries):
+        settings.USER_CACHE_TIMEOUT = 0
+        backend.get_user(user.pk)
+
+        with django_assert_num_queries(1):
+            backend.get_user(user.pk)
+
+    @pytest.mark.usefixtures("backend")
+    def test_changing_password_logs_out_other_sessions(self, client, user, home_url):
+        client.force_login(user)
+        client.get(home_url)
+        user.set_password("a new password")
+        user.save()
+
+        assert not client.get(home_url).wsgi_request.user.is_authenticated
@@ -0,0 +1,19 @@
+import datetime
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+def test_clear_expired_sessions(capsys):
+    now = timezone.now()
+    for i in range(5):
+        Session.objects.create(session_key=f"expired{i}", session_data="", expire_date=now - datetime.timedelta(1))
+    Session.objects.create(session_key="current", session_data="", expire_date=now + datetime.timedelta(1))
+
+    call_command("clear_expired_sessions", batch_size=2)
+
+    assert list(Session.objects.values_list("pk", flat=True)) == ["current"]
+    assert "Deleted 5 expired sessions." in capsys.readouterr().out
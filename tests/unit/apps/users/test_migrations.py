@@ -0,0 +1,32 @@
+import importlib
+
+import pytest
+from django.apps import apps
+
+from users.models import User
+
+lowercase_emails_migration = importlib.import_module("users.migrations.0005_lowercase_emails")
+
+
+@pytest.mark.django_db
+class TestLowercaseEmails:
+    def test_lowercases_emails(self, user_factory, monkeypatch):
+        monkeypatch.setattr(lowercase_emails_migration, "BATCH_SIZE", 2)
+        users = user_factory.create_batch(5)
+        for i, user in enumerate(users):
+            # Bypasses User.save(), which would lowercase them.
+            User.objects.filter(pk=user.pk).update(email=f"User{i}@Example.com")
+
+        lowercase_emails_migration.lowercase_emails(apps, None)
+
+        assert sorted(User.objects.values_list("email", flat=True)) == [f"user{i}@example.com" for i in range(5)]
+
+    def test_fails_if_emails_only_differ_by_case(self, user_factory):
+        users = user_factory.create_batch(2)
+        User.objects.filter(pk=users[0].pk).update(email="Bob@example.com")
+        User.objects.filter(pk=users[1].pk).update(email="bob@example.com")
+
+        with pytest.raises(RuntimeError, match="bob@example.com"):
+            lowercase_emails_migration.lowercase_emails(apps, None)
+
+        assert User.objects.filter(email="Bob@example.com").exists()
@@ -1,4 +1,5 @@
 import pytest
+from django.contrib.auth import authenticate
 
 from users.models import User
 
@@ -11,9 +12,52 @@ class TestUserManager:
     def test_exists_with_email_is_False_if_user_doesnt_exist(self):
         assert not User.objects.exists_with_email("john.smith@gmail.com")
 
+    def test_exists_with_email_ignores_case(self, user_factory):
+        user_factory(email="john.smith@gmail.com")
+
+        assert User.objects.exists_with_email("John.Smith@Gmail.com")
+
+    def test_get_by_natural_key_ignores_case(self, user_factory):
+        user = user_factory(email="john.smith@gmail.com")
+
+        assert User.objects.get_by_natural_key("John.Smith@Gmail.com") == user
+
+    def test_with_email_prefix_returns_users_with_prefix_ordered_by_email(self, user_factory):
+        bob = user_factory(email="bob@example.com")
+        bobby = user_factory(email="bobby@example.com")
+        user_factory(email="alice@example.com")
+        user_factory(email="bo@example.com")
+        user_factory(email="boc@example.com")
+
+        assert list(User.objects.with_email_prefix("bob")) == [bob, bobby]
+
+    def test_with_email_prefix_ignores_case(self, user_factory):
+        bob = user_factory(email="Bob@example.com")
+
+        assert list(User.objects.with_email_prefix("bOB")) == [bob]
+
+    def test_with_email_prefix_treats_like_wildcards_literally(self, user_factory):
+        user_factory(email="bob@example.com")
+
+        assert not User.objects.with_email_prefix("b_b").exists()
+        assert not User.objects.with_email_prefix("b%").exists()
+
 
 class TestUser:
     @pytest.mark.django_db
     def test_can_save_more_than_one_user(self, user_factory):
         user_factory()
         user_factory()
+
+    @pytest.mark.django_db
+    def test_email_is_lowercased_when_saved(self, user_factory):
+        user = user_factory(email="John.Smith@Gmail.com")
+
+        user.refresh_from_db()
+        assert user.email == "john.smith@gmail.com"
+
+    @pytest.mark.django_db
+    def test_can_authenticate_with_email_in_any_case(self, user_factory):
+        user = user_factory(email="john.smith@gmail.com")
+
+        assert authenticate(username="John.Smith@Gmail.com", password=user.raw_password) == user
@@ -0,0 +1,58 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestAutocomplete:
+    @pytest.fixture
+    def autocomplete_url(self):
+        """URL of the autocomplete view."""
+        return "/users/autocomplete/"
+
+    @pytest.fixture
+    def logged_in_client(self, client, user_factory):
+        client.force_login(user_factory(email="owner@example.com"))
+        return client
+
+    def test_redirects_to_login_page_if_user_not_logged_in(self, client, autocomplete_url, login_url, assert_redirects):
+        response = client.get(autocomplete_url, {"q": "bob"})
+
+        assert_redirects(response, login_url)
+
+    def test_returns_emails_with_prefix(self, logged_in_client, autocomplete_url, user_factory):
+        user_factory(email="bobby@example.com")
+        user_factory(email="bob@example.com")
+        user_factory(email="alice@example.com")
+
+        response = logged_in_client.get(autocomplete_url, {"q": "bob"})
+
+        assert response.json() == {"emails": ["bob@example.com", "bobby@example.com"]}
+
+    def test_doesnt_return_users_own_email(self, logged_in_client, autocomplete_url):
+        response = logged_in_client.get(autocomplete_url, {"q": "owner"})
+
+        assert response.json() == {"emails": []}
+
+    def test_returns_nothing_if_prefix_shorter_than_min_length(
+        self, logged_in_client, autocomplete_url, user_factory, settings
+    ):
+        settings.EMAIL_AUTOCOMPLETE_MIN_LENGTH = 3
+        user_factory(email="bob@example.com")
+
+        assert logged_in_client.get(autocomplete_url, {"q": " bo "}).json() == {"emails": []}
+
+    def test_returns_at_most_limit_emails(self, logged_in_client, autocomplete_url, user_factory, settings):
+        settings.EMAIL_AUTOCOMPLETE_LIMIT = 2
+        for i in range(3):
+            user_factory(email=f"bob{i}@example.com")
+
+        response = logged_in_client.get(autocomplete_url, {"q": "bob"})
+
+        assert response.json() == {"emails": ["bob0@example.com", "bob1@example.com"]}
+
+    def test_is_privately_cacheable(self, logged_in_client, autocomplete_url):
+        response = logged_in_client.get(autocomplete_url, {"q": "bob"})
+
+        assert "private" in response["Cache-Control"]
+
+    def test_only_allows_GET(self, logged_in_client, autocomplete_url):
+        assert logged_in_client.post(autocomplete_url, {"q": "bob"}).status_code == 405
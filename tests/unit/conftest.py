@@ -1,3 +1,5 @@
+import functools
+
 import pytest
 from pytest_django.asserts import assertRedirects, assertTemplateUsed
 
@@ -34,3 +36,15 @@ def assert_form_is_instance_with_errors():
         assert form.errors
 
     return assert_form_is_instance_with_errors
+
+
+@pytest.fixture
+def query_budget(request, django_assert_max_num_queries):
+    """
+    Context manager which fails the test if more queries are made inside it
+    than the budget set by the test's query_budget marker.
+    """
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        pytest.fail("query_budget fixture used without a query_budget marker")
+    return functools.partial(django_assert_max_num_queries, *marker.args, **marker.kwargs)
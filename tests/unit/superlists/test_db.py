@@ -0,0 +1,26 @@
+import pytest
+from django.db import connection, transaction
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestSqliteDatabaseWrapper:
+    def test_applies_pragmas(self, settings):
+        pragmas = settings.DATABASES["default"]["OPTIONS"]["pragmas"]
+
+        assert pragma("busy_timeout") == pragmas["busy_timeout"]
+        assert pragma("cache_size") == pragmas["cache_size"]
+        assert pragma("synchronous") == 1  # NORMAL
+
+    @pytest.mark.django_db(transaction=True)
+    def test_starts_transactions_in_transaction_mode(self, django_assert_num_queries):
+        with django_assert_num_queries(1) as captured:
+            with transaction.atomic():
+                pass
+
+        assert captured.captured_queries[0]["sql"] == "BEGIN immediate"
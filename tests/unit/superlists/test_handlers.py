@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import path
+
+from superlists import handlers
+from superlists.handlers import ASGIHandler
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def get(path, query_string=""):
+    """Make a GET request to the ASGI app and return the messages that it sends."""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query_string.encode(),
+        "headers": [(b"host", b"testserver")],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(ASGIHandler())(scope, receive, send)
+    return messages
+
+
+def body(messages):
+    return b"".join(message.get("body", b"") for message in messages[1:])
+
+
+class TestASGIHandler:
+    @pytest.fixture
+    def list(self, list_factory, item_factory, user_factory):
+        list_ = list_factory(owner=user_factory(email="owner@example.com"))
+        for i in range(5):
+            item_factory(list=list_, text=f"item {i}")
+        return list_
+
+    def test_streams_csv_export(self, list):
+        messages = get(f"/lists/{list.pk}/export/")
+
+        assert messages[0]["status"] == 200
+        assert (b"X-List-Owner", b"owner@example.com") in messages[0]["headers"]
+        assert body(messages).decode().splitlines() == ["text"] + [f"item {i}" for i in range(5)]
+
+    def test_streams_ndjson_export(self, list):
+        lines = body(get(f"/lists/{list.pk}/export/", "format=ndjson")).decode().splitlines()
+
+        assert json.loads(lines[0])["owner"] == "owner@example.com"
+        assert [json.loads(line)["text"] for line in lines[1:]] == [f"item {i}" for i in range(5)]
+
+
+def stream(request):
+    return StreamingHttpResponse(str(i) for i in range(5))
+
+
+def home(request):
+    return HttpResponse("home")
+
+
+urlpatterns = [path("stream/", stream), path("home/", home)]
+
+
+@pytest.mark.urls(__name__)
+def test_streams_in_batches(mocker):
+    mocker.patch.object(handlers, "STREAMING_BATCH_SIZE", 2)
+
+    messages = get("/stream/")
+
+    assert [message.get("body") for message in messages[1:]] == [b"01", b"23", b"4", None]
+
+
+@pytest.mark.urls(__name__)
+def test_sends_other_responses_as_django_does():
+    assert body(get("/home/")) == b"home"
@@ -0,0 +1,65 @@
+import pytest
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from superlists.db import health
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    health.reset_stats()
+
+
+def query():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+@pytest.mark.django_db(transaction=True)
+class TestHealth:
+    def test_counts_opened_connections(self):
+        # The test database is in memory, so closing its connection is a no-op.
+        connection_created.send(sender=connection.__class__, connection=connection)
+
+        assert health.stats()["default"]["opened"] == 1
+
+    def test_counts_reused_connections(self):
+        query()
+        health.check_connections()
+
+        assert health.stats()["default"]["reused"] == 1
+        assert connection.connection is not None
+
+    def test_closes_connections_which_fail_health_check(self, mocker):
+        query()
+        mocker.patch.object(connection, "is_usable", return_value=False)
+        close = mocker.patch.object(connection, "close")
+
+        health.check_connections()
+
+        assert health.stats()["default"]["failed_health_checks"] == 1
+        close.assert_called_once_with()
+
+    def test_doesnt_check_closed_connections(self, mocker):
+        mocker.patch.object(connection, "connection", None)
+
+        health.check_connections()
+
+        assert health.stats() == {}
+
+
+@pytest.mark.django_db
+class TestDbStats:
+    def test_returns_stats(self, client, user_factory):
+        client.force_login(user_factory(is_staff=True))
+
+        response = client.get("/db-stats/")
+
+        assert response.status_code == 200
+        assert "pid" in response.json()
+        assert "connections" in response.json()
+
+    def test_redirects_non_staff_to_login_page(self, client, user, login_url, assert_redirects):
+        client.force_login(user)
+
+        assert_redirects(client.get("/db-stats/"), login_url)
@@ -0,0 +1,109 @@
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+
+from superlists.db.routers import PIN_COOKIE
+from superlists.middleware import (
+    connection_health_middleware,
+    query_count_middleware,
+    replica_pin_middleware,
+)
+
+
+def make_two_queries():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 2")
+
+
+@pytest.mark.django_db
+class TestQueryCountMiddleware:
+    @pytest.fixture(autouse=True)
+    def db_query_headers(self, settings):
+        settings.DB_QUERY_HEADERS = True
+
+    @pytest.fixture
+    def response(self, rf):
+        """Response from a view which makes two queries."""
+
+        def view(request):
+            make_two_queries()
+            return HttpResponse()
+
+        return query_count_middleware(view)(rf.get("/"))
+
+    def test_reports_number_of_queries(self, response):
+        assert response["X-DB-Queries"] == "2"
+
+    def test_reports_time_spent_on_queries(self, response):
+        assert float(response["X-DB-Time"]) > 0
+
+    def test_adds_server_timing_entry(self, response):
+        assert response["Server-Timing"].startswith("db;dur=")
+        assert response["Server-Timing"].endswith('desc="2 queries"')
+
+    def test_header_is_set_on_real_responses(self, client, home_url):
+        assert client.get(home_url)["X-DB-Queries"] == "0"
+
+    def test_isnt_used_unless_enabled(self, settings):
+        settings.DB_QUERY_HEADERS = False
+
+        with pytest.raises(MiddlewareNotUsed):
+            query_count_middleware(lambda request: HttpResponse())
+
+    def test_headers_arent_set_on_real_responses_by_default(self, client, home_url, settings):
+        settings.DB_QUERY_HEADERS = False
+
+        assert not client.get(home_url).has_header("X-DB-Queries")
+
+    @pytest.mark.django_db(transaction=True)
+    def test_counts_queries_made_in_other_threads_by_async_views(self, rf):
+        async def view(request):
+            await sync_to_async(make_two_queries, thread_sensitive=False)()
+            return HttpResponse()
+
+        response = async_to_sync(query_count_middleware(view))(rf.get("/"))
+
+        assert response["X-DB-Queries"] == "2"
+
+
+class TestReplicaPinMiddleware:
+    @pytest.fixture
+    def middleware(self, settings):
+        settings.DATABASE_REPLICAS = ["replica1"]
+        settings.DATABASE_REPLICA_PIN_SECONDS = 10
+        return replica_pin_middleware(lambda request: HttpResponse())
+
+    def test_pins_client_after_POST(self, rf, middleware):
+        cookie = middleware(rf.post("/")).cookies[PIN_COOKIE]
+
+        assert cookie["max-age"] == 10
+        assert cookie["httponly"]
+
+    def test_doesnt_pin_client_after_GET(self, rf, middleware):
+        assert PIN_COOKIE not in middleware(rf.get("/")).cookies
+
+    def test_doesnt_pin_client_if_there_are_no_replicas(self, rf, middleware, settings):
+        settings.DATABASE_REPLICAS = []
+
+        assert PIN_COOKIE not in middleware(rf.post("/")).cookies
+
+    def test_pins_client_after_POST_to_async_view(self, rf, settings):
+        settings.DATABASE_REPLICAS = ["replica1"]
+
+        async def view(request):
+            return HttpResponse()
+
+        response = async_to_sync(replica_pin_middleware(view))(rf.post("/"))
+
+        assert PIN_COOKIE in response.cookies
+
+
+def test_connection_health_middleware_checks_connections(rf, mocker):
+    check_connections = mocker.patch("superlists.db.health.check_connections")
+
+    connection_health_middleware(lambda request: HttpResponse())(rf.get("/"))
+
+    check_connections.assert_called_once_with()
@@ -0,0 +1,64 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS
+
+from lists.models import List
+from superlists.db.routers import PIN_COOKIE, ReplicaRouter, read_from_replica
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica1"]
+    return settings.DATABASE_REPLICAS
+
+
+@pytest.fixture
+def db_for_read_in_view():
+    """
+    Function which makes a request to a view decorated with read_from_replica
+    and returns the database that the router chooses for reads in the view.
+    """
+
+    def db_for_read_in_view(request):
+        @read_from_replica
+        def view(request):
+            return ReplicaRouter().db_for_read(List)
+
+        return view(request)
+
+    return db_for_read_in_view
+
+
+class TestReadFromReplica:
+    @pytest.mark.usefixtures("replicas")
+    def test_reads_from_replica_for_GET(self, rf, db_for_read_in_view):
+        assert db_for_read_in_view(rf.get("/")) == "replica1"
+
+    @pytest.mark.usefixtures("replicas")
+    def test_reads_from_primary_for_POST(self, rf, db_for_read_in_view):
+        assert db_for_read_in_view(rf.post("/")) is None
+
+    @pytest.mark.usefixtures("replicas")
+    def test_reads_from_primary_if_client_is_pinned(self, rf, db_for_read_in_view):
+        request = rf.get("/")
+        request.COOKIES[PIN_COOKIE] = "1"
+
+        assert db_for_read_in_view(request) is None
+
+    def test_reads_from_primary_if_there_are_no_replicas(self, rf, db_for_read_in_view):
+        assert db_for_read_in_view(rf.get("/")) is None
+
+    @pytest.mark.usefixtures("replicas")
+    def test_reads_from_primary_outside_view(self, rf, db_for_read_in_view):
+        db_for_read_in_view(rf.get("/"))
+
+        assert ReplicaRouter().db_for_read(List) is None
+
+
+class TestReplicaRouter:
+    def test_writes_to_primary(self):
+        assert ReplicaRouter().db_for_write(List) == DEFAULT_DB_ALIAS
+
+    @pytest.mark.usefixtures("replicas")
+    def test_only_migrates_primary(self):
+        assert ReplicaRouter().allow_migrate(DEFAULT_DB_ALIAS, "lists")
+        assert not ReplicaRouter().allow_migrate("replica1", "lists")
@@ -0,0 +1,111 @@
+import gzip
+import json
+
+import brotli
+import pytest
+from django.contrib.staticfiles.storage import StaticFilesStorage
+from django.core.files.base import ContentFile
+
+from superlists.storage import (
+    CompressedManifestStaticFilesStorage,
+    purge_css,
+    used_tokens,
+)
+
+
+class TestPurgeCss:
+    def test_removes_rules_with_unused_classes(self):
+        css = ".button{color:red}.table{color:blue}"
+
+        assert purge_css(css, {"button"}) == ".button{color:red}"
+
+    def test_removes_unused_selectors_from_rules(self):
+        css = ".button,.table,a{color:red}"
+
+        assert purge_css(css, {"button"}) == ".button,a{color:red}"
+
+    def test_removes_selectors_with_any_unused_class(self):
+        css = ".button.is-large{color:red}.button .icon{color:blue}"
+
+        assert purge_css(css, {"button", "is-large"}) == ".button.is-large{color:red}"
+
+    def test_keeps_selectors_without_classes(self):
+        css = "html{color:red}a:hover{color:blue}"
+
+        assert purge_css(css, set()) == css
+
+    def test_ignores_commas_and_dots_in_brackets_and_strings(self):
+        css = '.button:not(.a,.b){color:red}a[href=".table,x"]{content:"}"}'
+
+        assert purge_css(css, {"button"}) == css
+
+    def test_purges_media_queries(self):
+        css = "@media screen{.button{color:red}.table{color:blue}}@media print{.table{color:blue}}"
+
+        assert purge_css(css, {"button"}) == "@media screen{.button{color:red}}"
+
+    def test_keeps_other_at_rules(self):
+        css = '@charset "utf-8";@keyframes spin{from{transform:rotate(0)}}'
+
+        assert purge_css(css, set()) == css
+
+
+def test_used_tokens(tmp_path):
+    template = tmp_path / "template.html"
+    template.write_text('<div class="button is-large">{{ form.text|add_class:"is-danger" }}</div>')
+
+    assert {"button", "is-large", "is-danger"} <= used_tokens([template])
+
+
+class TestCompressedManifestStaticFilesStorage:
+    @pytest.fixture
+    def source(self, tmp_path):
+        source = StaticFilesStorage(location=tmp_path / "source")
+        source.save("lists/site.css", ContentFile(b".button{color:red}.table{color:blue}" * 100))
+        source.save("lists/small.js", ContentFile(b"let x = 1;"))
+        return source
+
+    @pytest.fixture
+    def storage(self, tmp_path, settings):
+        template = tmp_path / "template.html"
+        template.write_text('<a class="button">')
+        settings.STATIC_PURGE_CSS = ["lists/site.css"]
+        settings.STATIC_PURGE_CONTENT = [str(template)]
+        return CompressedManifestStaticFilesStorage(location=tmp_path / "static")
+
+    def collect(self, source, storage):
+        paths = {}
+        for name in ("lists/site.css", "lists/small.js"):
+            with source.open(name) as f:
+                storage.save(name, f)
+            paths[name] = (source, name)
+        return list(storage.post_process(paths))
+
+    def test_hashes_names(self, source, storage):
+        self.collect(source, storage)
+
+        manifest = json.loads(storage.open("staticfiles.json").read())
+        assert set(manifest["paths"]) == {"lists/site.css", "lists/small.js"}
+        assert storage.exists(manifest["paths"]["lists/site.css"])
+
+    def test_purges_css_before_hashing(self, source, storage):
+        self.collect(source, storage)
+
+        hashed_name = storage.stored_name("lists/site.css")
+        assert storage.open(hashed_name).read() == b".button{color:red}" * 100
+        assert storage.open("lists/site.css").read() == b".button{color:red}" * 100
+
+    def test_saves_compressed_copies(self, source, storage):
+        self.collect(source, storage)
+
+        hashed_name = storage.stored_name("lists/site.css")
+        content = storage.open(hashed_name).read()
+        assert gzip.decompress(storage.open(f"{hashed_name}.gz").read()) == content
+        assert brotli.decompress(storage.open(f"{hashed_name}.br").read()) == content
+
+    def test_doesnt_compress_small_files(self, source, storage):
+        self.collect(source, storage)
+
+        hashed_name = storage.stored_name("lists/small.js")
+        assert not storage.exists(f"{hashed_name}.gz")
+        assert not storage.exists(f"{hashed_name}.br")
@@ -0,0 +1,34 @@
+import gc
+
+import pytest
+from django.template import engines
+from django.urls import clear_url_caches, get_resolver
+
+from superlists import warmup
+
+
+@pytest.fixture
+def unfreeze():
+    yield
+    gc.unfreeze()
+
+
+def test_warm_up():
+    clear_url_caches()
+    engine = engines["django"].engine
+    engine.template_loaders[0].reset()
+
+    warmup.warm_up()
+
+    cache = engine.template_loaders[0].get_template_cache
+    assert {"lists/home.html", "templates/base.html", "users/login.html"} <= set(cache)
+    assert get_resolver()._populated
+
+
+def test_freeze(unfreeze, mocker):
+    close_all = mocker.patch("superlists.warmup.connections.close_all")
+
+    warmup.freeze()
+
+    close_all.assert_called_once()
+    assert gc.get_freeze_count() > 0
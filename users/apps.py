@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     name = "users"
+
+    def ready(self):
+        from .backends import invalidate_cached_user
+        from .models import User
+
+        post_save.connect(invalidate_cached_user, sender=User)
+        post_delete.connect(invalidate_cached_user, sender=User)
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+
+def _cache_key(user_id):
+    return f"users:user:{user_id}"
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend which caches the user of each session for
+    USER_CACHE_TIMEOUT seconds, so that authenticated requests don't have to
+    query for them. Cached users are invalidated whenever they're saved or
+    deleted, but not by queryset updates.
+    """
+
+    def get_user(self, user_id):
+        if not settings.USER_CACHE_TIMEOUT:
+            return super().get_user(user_id)
+
+        key = _cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    cache.delete(_cache_key(instance.pk))
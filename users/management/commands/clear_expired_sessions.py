@@ -0,0 +1,37 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the expired sessions from the database in batches, so that other writers aren't locked out for the "
+        "duration of one big delete like they are by clearsessions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Number of sessions to delete at a time. Defaults to {DEFAULT_BATCH_SIZE}.",
+        )
+        parser.add_argument("--pause", type=float, default=0, help="Seconds to wait between batches. Defaults to 0.")
+
+    def handle(self, batch_size, pause, **options):
+        now = timezone.now()
+        expired_keys = Session.objects.filter(expire_date__lt=now).values_list("pk", flat=True)
+        deleted = 0
+        while True:
+            batch = list(expired_keys[:batch_size])
+            if not batch:
+                break
+            deleted += Session.objects.filter(pk__in=batch).delete()[0]
+            if pause:
+                time.sleep(pause)
+
+        self.stdout.write(f"Deleted {deleted} expired sessions.")
@@ -0,0 +1,58 @@
+from django.db import migrations, transaction
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+BATCH_SIZE = 1000
+
+
+def check_for_collisions(User):
+    """
+    Raise an error if any emails only differ by case, as they can't be
+    lowercased without breaking their unique constraint. Those users have to
+    be merged or have their emails changed by hand first.
+    """
+    collisions = list(
+        User.objects.annotate(lower_email=Lower("email"))
+        .values("lower_email")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .values_list("lower_email", flat=True)[:10]
+    )
+    if collisions:
+        raise RuntimeError(f"Some users' emails only differ by case: {', '.join(collisions)}")
+
+
+def lowercase_emails(apps, schema_editor):
+    """
+    Lowercase the users' emails in batches, in order of primary key, so that
+    each batch's transaction only locks a few rows for a short time.
+    """
+    User = apps.get_model("users", "User")
+    check_for_collisions(User)
+
+    last_pk = 0
+    while True:
+        batch = list(User.objects.filter(pk__gt=last_pk).order_by("pk").only("pk", "email")[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        changed = [user for user in batch if user.email != user.email.lower()]
+        for user in changed:
+            user.email = user.email.lower()
+        with transaction.atomic():
+            User.objects.bulk_update(changed, ["email"])
+
+
+class Migration(migrations.Migration):
+
+    # Each batch is committed on its own.
+    atomic = False
+
+    dependencies = [
+        ("users", "0004_auto_20200727_2352"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
@@ -3,8 +3,36 @@ from django.db import models
 
 
 class UserManager(auth_models.UserManager):
+    """
+    Emails are stored lowercased so that they can be matched case
+    insensitively with exact lookups, which use the unique index on email.
+    Normalize an email with normalize_email() before looking it up.
+    """
+
+    @classmethod
+    def normalize_email(cls, email):
+        """Lowercase the whole of an email, rather than just its domain."""
+        return (email or "").lower()
+
+    def get_by_natural_key(self, email):
+        return super().get_by_natural_key(self.normalize_email(email))
+
     def exists_with_email(self, email):
-        return self.filter(email=email).exists()
+        return self.filter(email=self.normalize_email(email)).exists()
+
+    def with_email_prefix(self, prefix):
+        """
+        Return the users whose emails start with a prefix, ignoring case,
+        ordered by email.
+
+        The emails are filtered to the range of strings which start with the
+        prefix as well as with startswith, which is a LIKE that can't use the
+        index on email on SQLite, where it's case insensitive, or on
+        PostgreSQL, unless the column's collation is C. The range can.
+        """
+        prefix = self.normalize_email(prefix)
+        upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return self.filter(email__gte=prefix, email__lt=upper_bound, email__startswith=prefix).order_by("email")
 
 
 class User(auth_models.AbstractUser):
@@ -15,3 +43,7 @@ class User(auth_models.AbstractUser):
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
+
+    def save(self, *args, **kwargs):
+        self.email = User.objects.normalize_email(self.email)
+        super().save(*args, **kwargs)
@@ -1,8 +1,16 @@
+from django.conf import settings
 from django.contrib.auth import views as auth_views
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.urls import reverse_lazy
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
 from django.views.generic import CreateView
 
+from superlists.db.routers import read_from_replica
+
 from .forms import AuthenticationForm, UserCreationForm
+from .models import User
 
 
 class LoginView(auth_views.LoginView):
@@ -18,3 +26,20 @@ class SignupView(CreateView):
     form_class = UserCreationForm
     template_name = "users/signup.html"
     success_url = reverse_lazy("users:login")
+
+
+@require_GET
+@login_required(redirect_field_name=None)
+@cache_control(private=True, max_age=60)
+@read_from_replica
+def autocomplete(request):
+    """
+    Return the first few emails of the other users which start with the "q"
+    parameter, which has to be at least EMAIL_AUTOCOMPLETE_MIN_LENGTH long.
+    """
+    prefix = request.GET.get("q", "").strip()
+    emails = []
+    if len(prefix) >= settings.EMAIL_AUTOCOMPLETE_MIN_LENGTH:
+        users = User.objects.with_email_prefix(prefix).exclude(pk=request.user.pk)
+        emails = list(users.values_list("email", flat=True)[: settings.EMAIL_AUTOCOMPLETE_LIMIT])
+    return JsonResponse({"emails": emails})